@@ -14,6 +14,11 @@ import logging
 import multiprocessing
 import shutil
 import re  # Import regex module
+import queue
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
 import colorama
 from tqdm import tqdm
@@ -34,7 +39,13 @@ except ImportError:
 from lib.extractor import Extractor
 from lib.converter import Converter
 from lib.playlist import PlaylistManager
-from lib.utils import setup_logging, Timer, confirm_path
+from lib.utils import setup_logging, Timer, confirm_path, format_time, is_nonempty_file
+
+# Number of extracted archives allowed to wait for a free converter
+EXTRACT_QUEUE_DEPTH = 2
+
+# Disc identifiers stripped from archive names when estimating the unique game count
+DISC_SUFFIX_PATTERN = re.compile(r"\s*\((?:Disc \d+|CD\d+|Disk \d+|Track \d+)\)", re.IGNORECASE)
 
 
 def parse_args():
@@ -143,17 +154,163 @@ def prompt_user_input(args):
     return source_dir, dest_dir, keep_files, max_workers, state_file, skip_playlist_scan
 
 
+def _scan_7z_files(directory):
+    """Recursively yield .7z files below a directory using cached directory entries."""
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _scan_7z_files(entry.path)
+            elif entry.name.lower().endswith(".7z") and entry.is_file():
+                yield Path(entry.path)
+
+
 def find_7z_files(source_dir):
     """Find all .7z files in the source directory."""
     logger = logging.getLogger("main")
     logger.info(f"Searching for .7z files in {source_dir}")
 
-    files = list(source_dir.glob("**/*.7z"))
+    files = list(_scan_7z_files(source_dir))
     logger.info(f"Found {len(files)} .7z files")
 
     return files
 
 
+def prepare_archive(archive_path, extractor, playlist_manager, dest_dir, existing_chds=None):
+    """
+    Extract a single archive and locate its convertible files.
+
+    Args:
+        archive_path (Path): Path to the .7z archive.
+        extractor (Extractor): Shared extractor instance.
+        playlist_manager (PlaylistManager): Shared playlist manager.
+        dest_dir (Path): Destination directory for CHD files.
+        existing_chds (set, optional): CHD names already in dest_dir. Archives whose CHD is
+            not listed are not stat'ed. Defaults to checking the filesystem directly.
+
+    Returns:
+        tuple or None: (extract_dir, convertible_files), or None if the archive was skipped.
+    """
+    logger = logging.getLogger("main")
+    archive_name = archive_path.name
+    logger.info(f"Processing archive: {archive_name}")
+
+    # Pre-check if we can skip processing (if CHD already exists)
+    chd_name = f"{archive_path.stem}.chd"
+    chd_path = dest_dir / chd_name
+
+    if (existing_chds is None or chd_name in existing_chds) and is_nonempty_file(chd_path):
+        logger.info(f"Skipping {archive_name} - CHD already exists: {chd_name}")
+
+        # Register the disc without forcing a full directory scan; this keeps track
+        # of the disc but doesn't update playlists yet. Discs that are not part of a
+        # series are ignored by register_disc itself.
+        playlist_manager.register_disc(chd_path, update_playlists=False)
+
+        return None
+
+    # Extract into a unique directory, archives with the same name may be in flight together
+    extract_dir = Path(tempfile.mkdtemp(prefix=f"{archive_path.stem}_", dir=extractor.temp_dir))
+    extract_dir = extractor.extract_archive(archive_path, extract_dir)
+
+    # Skip if extraction was skipped (already converted)
+    if extract_dir is None:
+        logger.info(f"Skipped extraction of {archive_name} (already converted)")
+        return None
+
+    # Find convertible files
+    convertible_files = extractor.identify_disc_files(extract_dir)
+
+    if not convertible_files:
+        logger.warning(f"No convertible files found in {archive_name}")
+        extractor.cleanup_extracted_files(extract_dir)
+        return None
+
+    return extract_dir, convertible_files
+
+
+def _delete_archive(archive_path):
+    """Delete an original archive, logging rather than raising on failure."""
+    try:
+        archive_path.unlink()
+    except OSError as e:
+        logging.getLogger("main").error(f"Failed to delete archive {archive_path}: {e}")
+
+
+def convert_archive(
+    archive_path,
+    extract_dir,
+    convertible_files,
+    converter,
+    dest_dir,
+    keep_files,
+    cleanup_executor,
+    existing_chds=None,
+):
+    """
+    Convert the files extracted from an archive and clean up afterwards.
+
+    Args:
+        archive_path (Path): Path to the .7z archive.
+        extract_dir (Path): Directory the archive was extracted to.
+        convertible_files (list): List of tuples (file_path, file_type) to convert.
+        converter (Converter): Shared converter instance.
+        dest_dir (Path): Destination directory for CHD files.
+        keep_files (bool): Whether to keep the original archive.
+        cleanup_executor (Executor): Executor that removes extraction directories and
+                                     deleted archives off the conversion path.
+        existing_chds (set, optional): CHD names listed in dest_dir before the batch
+                                       started. Defaults to listing dest_dir per archive.
+
+    Returns:
+        dict: Mapping of input files to (output_file, success) tuples.
+    """
+    logger = logging.getLogger("main")
+
+    try:
+        # Convert files
+        conversion_result = converter.convert_multiple(convertible_files, dest_dir, existing_chds)
+    finally:
+        # Clean up extracted files in the background so this worker can take the next archive
+        if extract_dir:
+            logger.debug("Cleaning up extraction directory: %s", extract_dir)
+            cleanup_executor.submit(shutil.rmtree, extract_dir, ignore_errors=True)
+
+    # Delete original archive if requested, also in the background
+    if not keep_files:
+        logger.info(f"Deleting original archive: {archive_path}")
+        cleanup_executor.submit(_delete_archive, archive_path)
+
+    # Ensure conversion_result is not None before trying to use it
+    return conversion_result or {}
+
+
+def _extract_ahead(
+    archive_queue, extract_queue, extractor, playlist_manager, dest_dir, existing_chds
+):
+    """
+    Producer thread: extract queued archives and hand them to the conversion stage.
+
+    Several producers may share archive_queue. Each extract_queue item is
+    (archive_path, prepared) where prepared is the result of prepare_archive() or the
+    exception it raised. Each producer puts a final None when archive_queue is drained.
+    """
+    while True:
+        try:
+            archive_path = archive_queue.get_nowait()
+        except queue.Empty:
+            break
+
+        try:
+            prepared = prepare_archive(
+                archive_path, extractor, playlist_manager, dest_dir, existing_chds
+            )
+        except Exception as e:
+            prepared = e
+        extract_queue.put((archive_path, prepared))
+
+    extract_queue.put(None)
+
+
 def batch_process(
     source_dir,
     dest_dir,
@@ -200,18 +357,7 @@ def batch_process(
         }
 
     # Estimate unique game count (for more accurate progress reporting)
-    unique_games = set()
-    for archive in archive_files:
-        # Extract base game name by removing common disc identifiers
-        base_name = archive.stem
-        for pattern in [
-            r"\s*\(Disc \d+\)",
-            r"\s*\(CD\d+\)",
-            r"\s*\(Disk \d+\)",
-            r"\s*\(Track \d+\)",
-        ]:
-            base_name = re.sub(pattern, "", base_name, flags=re.IGNORECASE)
-        unique_games.add(base_name)
+    unique_games = {DISC_SUFFIX_PATTERN.sub("", archive.stem) for archive in archive_files}
 
     logger.info(
         f"Found approximately {len(unique_games)} unique games in {len(archive_files)} archives"
@@ -222,87 +368,117 @@ def batch_process(
         f"{colorama.Fore.YELLOW}Processing {len(archive_files)} archives...{colorama.Style.RESET_ALL}"
     )
 
-    # Track conversion results
-    conversion_results = {}
-    converted_chd_files = []
-
-    # Process each archive
-    for i, archive_path in enumerate(tqdm(archive_files, desc="Archives", unit="file")):
-        archive_name = archive_path.name
-        logger.info(f"Processing archive {i+1}/{len(archive_files)}: {archive_name}")
-
-        try:
-            # Pre-check if we can skip processing (if CHD already exists)
-            base_game, disc_num = extractor._extract_game_info(archive_path.stem)
-            chd_name = f"{archive_path.stem}.chd"
-            chd_path = dest_dir / chd_name
-
-            if chd_path.exists():
-                logger.info(f"Skipping {archive_name} - CHD already exists: {chd_name}")
-
-                # Register with PlaylistManager
-                if base_game and disc_num:
-                    # Register the disc without forcing a full directory scan
-                    # This keeps track of the disc but doesn't update playlists yet
-                    playlist_manager.register_disc(chd_path, update_playlists=False)
-
-                continue
-
-            # Extract archive
-            extract_dir = extractor.extract_archive(archive_path)
-
-            # Skip if extraction was skipped (already converted)
-            if extract_dir is None:
-                logger.info(f"Skipped extraction of {archive_name} (already converted)")
-                continue
-
-            # Find convertible files
-            convertible_files = extractor.identify_disc_files(extract_dir)
-
-            if not convertible_files:
-                logger.warning(f"No convertible files found in {archive_name}")
-                continue
+    # Running totals, updated as each archive finishes
+    processed_archives = 0
+    converted_files = 0
+    stats_lock = threading.Lock()
 
-            # Convert files
-            conversion_result = converter.convert_multiple(convertible_files, dest_dir)
+    workers = max(1, min(max_workers, len(archive_files)))
+    conversion_slots = threading.BoundedSemaphore(workers)
 
-            # Ensure conversion_result is not None before trying to use it
-            if conversion_result is None:
+    try:
+        # One directory listing instead of a stat per archive for the skip-existing check
+        existing_chds = converter.prescan_output(dest_dir)
+    except OSError:
+        existing_chds = None
+
+    # Extract ahead on producer threads so 7z decompression overlaps chdman conversion.
+    # The bounded queue plus the converter slots cap how many extracted images sit on disk.
+    archive_queue = queue.SimpleQueue()
+    for archive_path in archive_files:
+        archive_queue.put(archive_path)
+
+    extract_queue = queue.Queue(maxsize=EXTRACT_QUEUE_DEPTH)
+    extract_workers = max(1, workers // 2)
+    for _ in range(extract_workers):
+        threading.Thread(
+            target=_extract_ahead,
+            args=(
+                archive_queue,
+                extract_queue,
+                extractor,
+                playlist_manager,
+                dest_dir,
+                existing_chds,
+            ),
+            daemon=True,
+        ).start()
+
+    # Extraction directories and deleted archives are removed on a separate thread; leaving
+    # this block waits for every removal so the final temp directory cleanup does not race
+    with ThreadPoolExecutor(max_workers=1) as cleanup_executor, tqdm(
+        total=len(archive_files), desc="Archives", unit="file", mininterval=0.5
+    ) as progress:
+
+        def _conversion_done(future, archive_path):
+            nonlocal processed_archives, converted_files
+
+            try:
+                conversion_result = future.result()
+            except Exception as e:
+                logger.error(f"Failed to process archive {archive_path.name}: {e}", exc_info=True)
                 conversion_result = {}
-
-            conversion_results[archive_path] = conversion_result
-
-            # Collect successful CHD conversions
-            for input_file, result_tuple in conversion_result.items():
-                if result_tuple is not None:  # Make sure the tuple exists
-                    output_file, success = result_tuple
-                    if success and output_file:
-                        converted_chd_files.append(output_file)
-
-            # Clean up extracted files
-            if extract_dir and extract_dir.exists():
-                logger.debug(f"Cleaning up extraction directory: {extract_dir}")
-                shutil.rmtree(extract_dir)
-
-            # Delete original archive if requested
-            if not keep_files:
-                logger.info(f"Deleting original archive: {archive_path}")
-                archive_path.unlink()
-
-        except Exception as e:
-            logger.error(f"Failed to process archive {archive_name}: {e}", exc_info=True)
+            finally:
+                conversion_slots.release()
+                progress.update(1)
+
+            # Count successful CHD conversions
+            successes = sum(
+                1 for result_tuple in conversion_result.values() if result_tuple and result_tuple[1]
+            )
+            with stats_lock:
+                processed_archives += 1 if conversion_result else 0
+                converted_files += successes
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            finished_extractors = 0
+            while finished_extractors < extract_workers:
+                item = extract_queue.get()
+                if item is None:
+                    finished_extractors += 1
+                    continue
+
+                archive_path, prepared = item
+
+                if isinstance(prepared, Exception):
+                    logger.error(
+                        f"Failed to process archive {archive_path.name}: {prepared}",
+                        exc_info=prepared,
+                    )
+                    progress.update(1)
+                    continue
+
+                if prepared is None:
+                    progress.update(1)
+                    continue
+
+                extract_dir, convertible_files = prepared
+
+                conversion_slots.acquire()
+                future = executor.submit(
+                    convert_archive,
+                    archive_path,
+                    extract_dir,
+                    convertible_files,
+                    converter,
+                    dest_dir,
+                    keep_files,
+                    cleanup_executor,
+                    existing_chds,
+                )
+                future.add_done_callback(partial(_conversion_done, archive_path=archive_path))
 
     # Create M3U playlists for multi-disc games
     print(
         f"{colorama.Fore.YELLOW}Creating playlists for multi-disc games...{colorama.Style.RESET_ALL}"
     )
 
-    # Scan for any newly added discs and create playlists
-    # Force the update to regenerate all playlists for completeness
+    # Scan for any newly added discs and create playlists; only series whose disc set
+    # changed since their playlist was last written are rewritten
     playlist_count = len(playlist_manager.scan_directory(update_all=True))
 
-    # Make sure we check for any incomplete series too, with a full scan
-    incomplete_playlist_count = len(playlist_manager.check_for_incomplete_series(force_scan=True))
+    # Check for incomplete series too, the scan above has already refreshed the disc data
+    incomplete_playlist_count = len(playlist_manager.check_for_incomplete_series())
 
     # Clean up
     print(f"{colorama.Fore.YELLOW}Cleaning up...{colorama.Style.RESET_ALL}")
@@ -314,13 +490,6 @@ def batch_process(
     timer.stop()
 
     total_archives = len(archive_files)
-    processed_archives = sum(1 for results in conversion_results.values() if results)
-    converted_files = 0
-    for results in conversion_results.values():
-        for _, result_tuple in results.items():
-            if result_tuple and result_tuple[1]:  # Check if conversion was successful
-                converted_files += 1
-
     created_playlists = playlist_count + incomplete_playlist_count
 
     # Get series status information for reporting
@@ -351,8 +520,6 @@ def display_summary(statistics):
         ) * 100
 
     # Format elapsed time
-    from lib.utils import format_time
-
     elapsed_time = format_time(statistics["elapsed_time"])
 
     # Print summary
@@ -13,19 +13,43 @@ import os
 import logging
 import subprocess
 import shutil
+import sys
 import re
+import threading
 import time
+from collections import deque
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import tempfile
 
+try:
+    from lib.utils import drop_page_cache, is_nonempty_file
+except ImportError:  # Module run directly for testing
+    from utils import drop_page_cache, is_nonempty_file
+
 # Set up logging
 logger = logging.getLogger("converter")
 
+# Input formats converted with chdman createcd (createdvd for DVD-sized ISOs)
+CREATECD_EXTENSIONS = frozenset({".cue", ".gdi", ".toc", ".nrg", ".cdi", ".iso", ".bin", ".img"})
+
+# ISO images larger than any CD are DVDs and are converted with chdman createdvd
+DVD_ISO_MIN_SIZE = 900 * 1024 * 1024
+
+# Number of trailing chdman output lines kept for error reporting
+CHDMAN_OUTPUT_TAIL = 20
+
+# Project root, holding the chdman_path.txt config file and the bundled tools directory
+PROJECT_DIR = Path(__file__).parent.parent
+CHDMAN_CONFIG_FILE = PROJECT_DIR / "chdman_path.txt"
+
 
 class Converter:
     """Class for handling conversion of disc image files to CHD format."""
 
+    # chdman location found by the first auto-detecting Converter in this process
+    _chdman_cache = None
+
     def __init__(self, max_workers=None, chdman_path=None):
         """
         Initialize the converter.
@@ -34,9 +58,28 @@ class Converter:
             max_workers (int, optional): Maximum number of conversion workers. Defaults to CPU count.
             chdman_path (str, optional): Path to chdman executable. Defaults to None (auto-detect).
         """
-        self.max_workers = max_workers
+        self.max_workers = max_workers or os.cpu_count() or 1
         self.chdman_path = self._find_chdman() if chdman_path is None else Path(chdman_path)
 
+        # Caps concurrent chdman processes across all callers; archive-level and
+        # per-archive thread pools would otherwise multiply into max_workers squared
+        self._chdman_slots = threading.BoundedSemaphore(self.max_workers)
+
+        # Long-lived pool shared by every convert_multiple call; started on first use
+        # and shut down in cleanup()
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+        # chdman compresses on every core by default; running processes share them instead
+        self._active_chdman = 0
+        self._active_lock = threading.Lock()
+
+        # chdman binary that last passed check_conversion_tools()
+        self._verified_chdman = None
+
+        # Output directories convert_to_chd has already created
+        self._output_dirs = set()
+
         # Initialize reference to extractor and playlist manager (will be set later)
         self.extractor = None
         self.playlist_manager = None
@@ -67,7 +110,7 @@ class Converter:
 
     def _find_chdman(self):
         """
-        Find the chdman executable.
+        Find the chdman executable, searching only once per process.
 
         Returns:
             Path: Path to chdman executable.
@@ -75,23 +118,37 @@ class Converter:
         Raises:
             FileNotFoundError: If chdman is not found.
         """
-        # Check if chdman_path.txt exists in the project root
-        script_dir = Path(__file__).parent.parent
-        config_file = script_dir / "chdman_path.txt"
+        if Converter._chdman_cache is None:
+            Converter._chdman_cache = self._search_chdman()
+        return Converter._chdman_cache
+
+    def _search_chdman(self):
+        """
+        Search the config file, PATH and common install locations for chdman.
+
+        Returns:
+            Path: Path to chdman executable.
 
-        if config_file.exists():
-            with open(config_file, "r") as f:
+        Raises:
+            FileNotFoundError: If chdman is not found.
+        """
+        # Check if chdman_path.txt exists in the project root
+        try:
+            with open(CHDMAN_CONFIG_FILE, "r") as f:
                 chdman_path = f.read().strip()
+        except FileNotFoundError:
+            chdman_path = ""
 
-            # Validate the path
-            if os.path.exists(chdman_path):
-                logger.info(f"Using chdman from config file: {chdman_path}")
-                return Path(chdman_path)
+        # Validate the path
+        if chdman_path and os.path.isfile(chdman_path):
+            logger.info(f"Using chdman from config file: {chdman_path}")
+            return Path(chdman_path)
 
         # Check if chdman is in PATH
         chdman_in_path = shutil.which("chdman")
         if chdman_in_path:
             logger.info(f"Using chdman from PATH: {chdman_in_path}")
+            self._save_chdman_path(chdman_in_path)
             return Path(chdman_in_path)
 
         # Try common installation locations
@@ -103,16 +160,16 @@ class Converter:
                 [
                     Path(r"C:\Program Files\MAME\chdman.exe"),
                     Path(r"C:\Program Files (x86)\MAME\chdman.exe"),
-                    script_dir / "tools" / "chdman" / "chdman.exe",
+                    PROJECT_DIR / "tools" / "chdman" / "chdman.exe",
                 ]
             )
         # macOS
-        elif os.name == "posix" and "darwin" in os.uname().sysname.lower():
+        elif sys.platform == "darwin":
             common_locations.extend(
                 [
                     Path("/Applications/MAME.app/Contents/MacOS/chdman"),
                     Path.home() / "Applications" / "MAME.app" / "Contents" / "MacOS" / "chdman",
-                    script_dir / "tools" / "chdman" / "chdman",
+                    PROJECT_DIR / "tools" / "chdman" / "chdman",
                 ]
             )
         # Linux
@@ -121,7 +178,7 @@ class Converter:
                 [
                     Path("/usr/bin/chdman"),
                     Path("/usr/local/bin/chdman"),
-                    script_dir / "tools" / "chdman" / "chdman",
+                    PROJECT_DIR / "tools" / "chdman" / "chdman",
                 ]
             )
 
@@ -129,6 +186,7 @@ class Converter:
         for location in common_locations:
             if location.exists():
                 logger.info(f"Using chdman from common location: {location}")
+                self._save_chdman_path(location)
                 return location
 
         # Not found, will need to prompt user
@@ -136,7 +194,21 @@ class Converter:
             "chdman executable not found. Please run setup.py or manually specify the path."
         )
 
-    def convert_to_chd(self, input_file, output_dir=None, overwrite=False):
+    def _save_chdman_path(self, chdman_path):
+        """
+        Remember a discovered chdman location so later runs skip the search.
+
+        Args:
+            chdman_path (str): Path to chdman executable.
+        """
+        try:
+            with open(CHDMAN_CONFIG_FILE, "w") as f:
+                f.write(str(chdman_path))
+            logger.debug(f"chdman path stored in configuration file: {CHDMAN_CONFIG_FILE}")
+        except OSError as e:
+            logger.debug(f"Could not store chdman path in {CHDMAN_CONFIG_FILE}: {e}")
+
+    def convert_to_chd(self, input_file, output_dir=None, overwrite=False, register=True):
         """
         Convert a disc image file to CHD format.
 
@@ -144,154 +216,201 @@ class Converter:
             input_file (str): Path to input file.
             output_dir (str, optional): Directory to save CHD file. Defaults to same directory as input.
             overwrite (bool, optional): Whether to overwrite existing files. Defaults to False.
+            register (bool, optional): Whether to register the CHD for playlists. Defaults to True.
 
         Returns:
             tuple: (output_file, success) where output_file is the path to the created CHD file
                   and success is a boolean indicating whether conversion was successful.
         """
-        input_path = Path(input_file)
+        # convert_multiple hands over Path objects already; only wrap plain strings
+        input_path = input_file if isinstance(input_file, Path) else Path(input_file)
 
         # Determine output directory and filename
-        output_directory = Path(output_dir) if output_dir else input_path.parent
+        if output_dir:
+            output_directory = output_dir if isinstance(output_dir, Path) else Path(output_dir)
+        else:
+            output_directory = input_path.parent
         output_file = output_directory / f"{input_path.stem}.chd"
 
-        # Create output directory if it doesn't exist
-        os.makedirs(output_directory, exist_ok=True)
-
-        # Skip if output file already exists and overwrite is False
-        if output_file.exists() and not overwrite:
+        # Skip if output file already exists and overwrite is False; a single stat, and an
+        # empty leftover from an interrupted run is converted again
+        if not overwrite and is_nonempty_file(output_file):
             logger.info(
                 f"Skipping conversion of {input_path.name} - CHD already exists: {output_file.name}"
             )
 
-            # Register with PlaylistManager if available
-            if self.playlist_manager:
-                base_game, disc_num = self.playlist_manager._extract_base_name_and_disc(
-                    input_path.stem
-                )
-                if base_game and disc_num:
-                    self.playlist_manager.register_disc(output_file)
-            # Legacy tracking via Extractor
-            elif self.extractor:
-                base_game, disc_num = self.extractor._extract_game_info(input_path.stem)
-                if base_game and disc_num:
-                    if hasattr(self.extractor, "processed_games"):
-                        if base_game not in self.extractor.processed_games:
-                            self.extractor.processed_games[base_game] = []
-                        if disc_num not in self.extractor.processed_games[base_game]:
-                            self.extractor.processed_games[base_game].append(disc_num)
+            if register:
+                self._register_output(output_file)
 
             return output_file, True
 
         # Determine input file type and corresponding chdman command
         input_extension = input_path.suffix.lower()
 
-        # Get base command based on file extension
-        if input_extension == ".cue":
-            command = [
-                str(self.chdman_path),
-                "createcd",
-                "-i",
-                str(input_path),
-                "-o",
-                str(output_file),
-            ]
-        elif input_extension == ".gdi":
-            command = [
-                str(self.chdman_path),
-                "createcd",
-                "-i",
-                str(input_path),
-                "-o",
-                str(output_file),
-            ]
-        elif input_extension == ".toc":
-            command = [
-                str(self.chdman_path),
-                "createcd",
-                "-i",
-                str(input_path),
-                "-o",
-                str(output_file),
-            ]
-        elif input_extension == ".nrg":
-            command = [
-                str(self.chdman_path),
-                "createcd",
-                "-i",
-                str(input_path),
-                "-o",
-                str(output_file),
-            ]
-        elif input_extension == ".cdi":
-            command = [
-                str(self.chdman_path),
-                "createcd",
-                "-i",
-                str(input_path),
-                "-o",
-                str(output_file),
-            ]
-        elif input_extension == ".iso" or input_extension == ".bin" or input_extension == ".img":
-            command = [
-                str(self.chdman_path),
-                "createcd",
-                "-i",
-                str(input_path),
-                "-o",
-                str(output_file),
-            ]
-        else:
+        # Every supported format is a CD image that chdman reads with createcd
+        if input_extension not in CREATECD_EXTENSIONS:
             logger.warning(f"Unsupported file type: {input_extension}")
             return None, False
 
-        # Add common options
-        command.extend(["-f"])  # Force overwrite
+        # DVD-sized ISOs need createdvd; createcd would fail only after reading the image
+        create_command = "createcd"
+        if input_extension == ".iso":
+            try:
+                if input_path.stat().st_size > DVD_ISO_MIN_SIZE:
+                    create_command = "createdvd"
+            except OSError:
+                pass
+
+        # Create output directory if it doesn't exist; a batch writes everything to one
+        # directory, so it is only created on its first disc
+        if output_directory not in self._output_dirs:
+            os.makedirs(output_directory, exist_ok=True)
+            self._output_dirs.add(output_directory)
+
+        command = [
+            str(self.chdman_path),
+            create_command,
+            "-i",
+            str(input_path),
+            "-o",
+            str(output_file),
+            "-f",  # Force overwrite
+        ]
 
         logger.info(f"Converting {input_path.name} to CHD")
-        logger.debug(f"Command: {' '.join(command)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Command: %s", " ".join(command))
 
         try:
             # Execute chdman
-            result = subprocess.run(command, capture_output=True, text=True, check=False)
+            returncode, output_tail = self._run_chdman(command)
 
             # Check for successful conversion
-            if result.returncode == 0:
+            if returncode == 0:
                 logger.info(f"Successfully converted {input_path.name} to CHD: {output_file.name}")
 
-                # Register with PlaylistManager if available
-                if self.playlist_manager:
-                    base_game, disc_num = self.playlist_manager._extract_base_name_and_disc(
-                        input_path.stem
-                    )
-                    if base_game and disc_num:
-                        self.playlist_manager.register_disc(output_file)
-                # Legacy tracking via Extractor
-                elif self.extractor:
-                    base_game, disc_num = self.extractor._extract_game_info(input_path.stem)
-                    if base_game and disc_num:
-                        if hasattr(self.extractor, "processed_games"):
-                            if base_game not in self.extractor.processed_games:
-                                self.extractor.processed_games[base_game] = []
-                            if disc_num not in self.extractor.processed_games[base_game]:
-                                self.extractor.processed_games[base_game].append(disc_num)
+                # The new CHD will not be read again this run
+                drop_page_cache(output_file)
+
+                if register:
+                    self._register_output(output_file)
 
                 return output_file, True
             else:
-                logger.error(f"Failed to convert {input_path.name} to CHD. Error: {result.stderr}")
+                logger.error(f"Failed to convert {input_path.name} to CHD. Error: {output_tail}")
                 return None, False
 
         except Exception as e:
             logger.error(f"Error during conversion of {input_path.name}: {e}")
             return None, False
 
-    def convert_multiple(self, file_list, output_dir=None):
+    def _register_output(self, output_file):
+        """
+        Record a CHD with the PlaylistManager, or the Extractor's legacy tracking.
+
+        Args:
+            output_file (Path): Path to the CHD file.
+        """
+        # Register with PlaylistManager if available
+        if self.playlist_manager:
+            # register_disc parses the disc number itself and ignores single discs
+            self.playlist_manager.register_disc(output_file)
+        # Legacy tracking via Extractor
+        elif self.extractor:
+            base_game, disc_num = self.extractor._extract_game_info(output_file.stem)
+            if base_game and disc_num:
+                if hasattr(self.extractor, "processed_games"):
+                    if base_game not in self.extractor.processed_games:
+                        self.extractor.processed_games[base_game] = []
+                    if disc_num not in self.extractor.processed_games[base_game]:
+                        self.extractor.processed_games[base_game].append(disc_num)
+
+    def _run_chdman(self, command):
+        """
+        Run chdman and stream its output line by line.
+
+        Progress lines are logged as they arrive instead of being buffered until
+        exit; only the last few lines are kept for error reporting. The CPU cores
+        are divided between the chdman processes running at the time of the call.
+
+        Args:
+            command (list): chdman command line.
+
+        Returns:
+            tuple: (returncode, output_tail) where output_tail is the last lines of
+                   combined stdout/stderr output.
+        """
+        output_tail = deque(maxlen=CHDMAN_OUTPUT_TAIL)
+
+        with self._chdman_slots:
+            with self._active_lock:
+                self._active_chdman += 1
+                processors = max(1, (os.cpu_count() or 1) // self._active_chdman)
+
+            try:
+                returncode = self._stream_chdman(command + ["-np", str(processors)], output_tail)
+            finally:
+                with self._active_lock:
+                    self._active_chdman -= 1
+
+        return returncode, "\n".join(output_tail)
+
+    def _stream_chdman(self, command, output_tail):
+        """
+        Run a chdman command line, logging its output and keeping the last lines.
+
+        Args:
+            command (list): chdman command line.
+            output_tail (deque): Receives the trailing output lines.
+
+        Returns:
+            int: chdman exit status.
+        """
+        with subprocess.Popen(
+            command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            errors="replace",
+            bufsize=1,
+        ) as process:
+            # Universal newlines also split chdman's carriage-return progress updates
+            log_output = logger.isEnabledFor(logging.DEBUG)
+            for line in process.stdout:
+                line = line.rstrip()
+                if line:
+                    output_tail.append(line)
+                    if log_output:
+                        logger.debug("chdman: %s", line)
+
+            return process.wait()
+
+    def prescan_output(self, output_dir):
+        """
+        List the CHD files already in an output directory with a single scandir.
+
+        Args:
+            output_dir (str): Directory to list.
+
+        Returns:
+            set: Names of the CHD files directly inside output_dir.
+
+        Raises:
+            OSError: If the directory cannot be listed.
+        """
+        with os.scandir(output_dir) as entries:
+            return {entry.name for entry in entries if entry.name.endswith(".chd")}
+
+    def convert_multiple(self, file_list, output_dir=None, existing_chds=None):
         """
         Convert multiple files to CHD format.
 
         Args:
             file_list (list): List of tuples (file_path, file_type) to convert.
             output_dir (str, optional): Directory to save CHD files. Defaults to same directory as input.
+            existing_chds (set, optional): CHD names from prescan_output(output_dir). Discs
+                listed there are skipped without using the pool. Defaults to listing
+                output_dir now.
 
         Returns:
             dict: Mapping of input files to (output_file, success) tuples.
@@ -303,39 +422,69 @@ class Converter:
         # Prepare output dictionary
         results = {}
 
-        # Calculate effective workers based on list size
-        effective_workers = min(self.max_workers, len(file_list))
-
-        # Convert files with ThreadPoolExecutor
-        with ThreadPoolExecutor(max_workers=effective_workers) as executor:
-            future_to_file = {}
-
-            for file_path, _ in file_list:
-                logger.debug(f"Submitting file for conversion: {file_path}")
-                future = executor.submit(self.convert_to_chd, file_path, output_dir)
-                future_to_file[future] = file_path
-
-            # Process results as they complete
-            for future in future_to_file:
-                file_path = future_to_file[future]
+        # List the output directory once so finished discs from an earlier run are
+        # skipped here instead of each taking a trip through the pool
+        if existing_chds is None:
+            existing_chds = set()
+            if output_dir:
                 try:
-                    output_file, success = future.result()
-                    results[file_path] = (output_file, success)
-
-                    # After each conversion, check if any series are complete and need playlists
-                    if self.extractor and hasattr(self.extractor, "process_archive_series"):
-                        self.extractor.process_archive_series()
+                    existing_chds = self.prescan_output(output_dir)
+                except OSError:
+                    pass
+
+        # Convert files on the shared thread pool
+        future_to_file = {}
+        output_directory = Path(output_dir) if output_dir else None
+        for file_path, _ in file_list:
+            input_path = Path(file_path)
+            output_file = output_directory / f"{input_path.stem}.chd" if output_directory else None
+            if output_file and output_file.name in existing_chds and is_nonempty_file(output_file):
+                logger.info(
+                    f"Skipping conversion of {input_path.name} - "
+                    f"CHD already exists: {output_file.name}"
+                )
+                results[file_path] = (output_file, True)
+                continue
 
-                except Exception as e:
-                    logger.error(f"Conversion failed for {file_path}: {e}")
-                    results[file_path] = (None, False)
+            logger.debug("Submitting file for conversion: %s", input_path)
+            future = self._get_executor().submit(
+                self.convert_to_chd, input_path, output_directory, register=False
+            )
+            future_to_file[future] = file_path
+
+        # Process results as they complete
+        for future in as_completed(future_to_file):
+            file_path = future_to_file[future]
+            try:
+                output_file, success = future.result()
+                results[file_path] = (output_file, success)
+            except Exception as e:
+                logger.error(f"Conversion failed for {file_path}: {e}")
+                results[file_path] = (None, False)
+
+        # Register this call's CHDs in one pass on the calling thread, so each series
+        # is matched and its playlist refreshed once rather than once per disc
+        output_files = [output_file for output_file, success in results.values() if success]
+        if self.playlist_manager:
+            self.playlist_manager.register_multiple_discs(output_files)
+        else:
+            for output_file in output_files:
+                self._register_output(output_file)
 
-        # Process any final playlists
+        # Check once for series that are now complete and need playlists
         if self.playlist_manager:
             # Let PlaylistManager handle completion checking
             pass
         elif self.extractor and hasattr(self.extractor, "process_archive_series"):
-            self.extractor.process_archive_series()
+            # Only multi-disc series this call added discs to can have become complete;
+            # a call that produced only single-disc games skips the check entirely
+            base_games = set()
+            for output_file in output_files:
+                base_game, disc_num = self.extractor._extract_game_info(output_file.stem)
+                if disc_num:
+                    base_games.add(base_game)
+            if base_games:
+                self.extractor.process_archive_series(base_games)
 
         return results
 
@@ -351,17 +500,25 @@ class Converter:
             logger.error("chdman not found")
             return False
 
-        # Try running chdman to check if it works
+        if self.chdman_path == self._verified_chdman:
+            return True
+
+        # Try running chdman to check if it works; only the exit status matters
         try:
             result = subprocess.run(
-                [str(self.chdman_path), "--help"], capture_output=True, text=True, check=False
+                [str(self.chdman_path), "--help"],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                check=False,
             )
 
             if result.returncode != 0:
-                logger.error(f"chdman test failed with error: {result.stderr}")
+                error = result.stderr.decode(errors="replace").strip()
+                logger.error(f"chdman test failed with error: {error}")
                 return False
 
             logger.info("chdman test successful")
+            self._verified_chdman = self.chdman_path
             return True
 
         except Exception as e:
@@ -375,9 +532,6 @@ class Converter:
         Returns:
             Path: Path to chdman executable.
         """
-        script_dir = Path(__file__).parent.parent
-        config_file = script_dir / "chdman_path.txt"
-
         print("\n" + "=" * 60)
         print("chdman executable is required for CHD conversion.")
         print("Please enter the full path to the chdman executable:")
@@ -399,9 +553,9 @@ class Converter:
 
             # Verify the path
             if chdman_path.exists() and chdman_path.is_file():
-                # Save the path to config file
-                with open(config_file, "w") as f:
-                    f.write(str(chdman_path))
+                # Save the path to config file and use it for later converters
+                self._save_chdman_path(chdman_path)
+                Converter._chdman_cache = chdman_path
 
                 print(f"chdman path saved: {chdman_path}")
                 return chdman_path
@@ -410,8 +564,26 @@ class Converter:
                 print("The file does not exist or is not a valid executable.")
                 print("Please enter a valid path to chdman.")
 
+    def _get_executor(self):
+        """
+        Return the shared conversion thread pool, starting it if needed.
+
+        Returns:
+            ThreadPoolExecutor: Pool used by convert_multiple.
+        """
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="converter"
+                )
+            return self._executor
+
     def cleanup(self):
-        """Clean up temporary files."""
+        """Clean up temporary files and stop the conversion thread pool."""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
         logger.debug("Converter cleanup completed")
 
 
@@ -422,8 +594,6 @@ if __name__ == "__main__":
         level=logging.DEBUG, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
     )
 
-    import sys
-
     # Create converter
     converter = Converter()
 
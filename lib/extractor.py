@@ -18,7 +18,12 @@ import psutil
 import re
 from pathlib import Path
 import py7zr
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+try:
+    from lib.utils import drop_page_cache
+except ImportError:  # Module run directly for testing
+    from utils import drop_page_cache
 
 # Set up logging
 logger = logging.getLogger("extractor")
@@ -28,6 +33,51 @@ SIZE_THRESHOLD_LARGE = 4 * 1024 * 1024 * 1024  # 4GB
 SIZE_THRESHOLD_MEDIUM = 1 * 1024 * 1024 * 1024  # 1GB
 SIZE_THRESHOLD_SMALL = 100 * 1024 * 1024  # 100MB
 
+# Seconds a system resource sample is reused before it is taken again
+RESOURCE_SAMPLE_TTL = 2.0
+
+# Disc image formats that chdman can read directly
+IMAGE_EXTENSIONS = (".iso", ".bin", ".img", ".nrg", ".cdi")
+
+# Descriptor formats that reference track files by name (tracks may use any extension)
+DESCRIPTOR_EXTENSIONS = (".cue", ".gdi", ".toc")
+
+# Files commonly bundled with disc images that are never part of a disc. .dat is not
+# listed, since cue and toc sheets can reference raw tracks with that extension
+EXTRA_EXTENSIONS = (
+    ".txt",
+    ".nfo",
+    ".diz",
+    ".htm",
+    ".html",
+    ".url",
+    ".pdf",
+    ".jpg",
+    ".jpeg",
+    ".png",
+    ".gif",
+    ".bmp",
+    ".sfv",
+    ".md5",
+    ".sha1",
+    ".log",
+)
+
+# Common disc identifier patterns for legacy game info extraction, tried in order
+LEGACY_DISC_PATTERNS = tuple(
+    re.compile(pattern)
+    for pattern in (
+        r"(?i)[\[(]?disc\s*(\d+)[\])]?",  # (Disc 1), [Disc 2], Disc 3
+        r"(?i)[\[(]?cd\s*(\d+)[\])]?",  # (CD 1), [CD 2], CD 3
+        r"(?i)[\[(]?disk\s*(\d+)[\])]?",  # (Disk 1), [Disk 2], Disk 3
+        r"(?i)[\[(]?volume\s*(\d+)[\])]?",  # (Volume 1), [Volume 2]
+        r"(?i)[\[(]?vol\s*(\d+)[\])]?",  # (Vol 1), [Vol 2]
+        r"(?i)[\[(]?d(\d+)[\])]?",  # (D1), [D2], D3
+        r"(?i)[\s\-\_\.]+d(\d+)[\s\-\_\.]?",  # Game - D1, Game_D2, Game.D3
+        r"[\s\-\_\.]+(\d+)[\s\-\_\.]?",  # Game - 1, Game_2, Game.3
+    )
+)
+
 
 class Extractor:
     """Class for handling extraction of .7z archives with adaptive resource management and resume capability."""
@@ -46,6 +96,9 @@ class Extractor:
         self.output_dir = Path(output_dir) if output_dir else None
         self.extraction_queue = []
 
+        # Files written by extract_archive, keyed by extraction directory
+        self.extracted_files = {}
+
         # Track processed games for M3U creation (legacy tracking, can be replaced by PlaylistManager)
         self.processed_games = {}
         self.completed_game_series = set()
@@ -53,6 +106,12 @@ class Extractor:
         # Reference to the playlist manager (will be set later)
         self.playlist_manager = None
 
+        # Last (timestamp, resources) sample from check_system_resources
+        self._resource_sample = None
+
+        # Prime psutil's CPU counters so later non-blocking readings are meaningful
+        psutil.cpu_percent(interval=None)
+
         # Create temp directory if it doesn't exist
         os.makedirs(self.temp_dir, exist_ok=True)
 
@@ -95,33 +154,41 @@ class Extractor:
             return self.playlist_manager._extract_base_name_and_disc(filename)
 
         # Legacy implementation
-        # Common disc identifier patterns
-        disc_patterns = [
-            r"(?i)[\[(]?disc\s*(\d+)[\])]?",  # (Disc 1), [Disc 2], Disc 3
-            r"(?i)[\[(]?cd\s*(\d+)[\])]?",  # (CD 1), [CD 2], CD 3
-            r"(?i)[\[(]?disk\s*(\d+)[\])]?",  # (Disk 1), [Disk 2], Disk 3
-            r"(?i)[\[(]?volume\s*(\d+)[\])]?",  # (Volume 1), [Volume 2]
-            r"(?i)[\[(]?vol\s*(\d+)[\])]?",  # (Vol 1), [Vol 2]
-            r"(?i)[\[(]?d(\d+)[\])]?",  # (D1), [D2], D3
-            r"(?i)[\s\-\_\.]+d(\d+)[\s\-\_\.]?",  # Game - D1, Game_D2, Game.D3
-            r"[\s\-\_\.]+(\d+)[\s\-\_\.]?",  # Game - 1, Game_2, Game.3
-        ]
-
         # Strip extension
         name = Path(filename).stem
 
         # Try to match disc patterns
-        for pattern in disc_patterns:
-            match = re.search(pattern, name)
+        for pattern in LEGACY_DISC_PATTERNS:
+            match = pattern.search(name)
             if match:
                 disc_num = int(match.group(1))
                 # Remove the disc information from the name
-                base_name = re.sub(pattern, "", name).strip(" -_.")
+                base_name = pattern.sub("", name).strip(" -_.")
                 return base_name, disc_num
 
         # No disc pattern found
         return name, None
 
+    def _track_processed_game(self, filename):
+        """
+        Record a disc in the legacy processed_games tracking.
+
+        Only needed without a PlaylistManager, which registers discs during conversion;
+        the filename is not parsed at all in that case.
+
+        Args:
+            filename (str): Filename to parse.
+        """
+        if self.playlist_manager:
+            return
+
+        base_game, disc_num = self._extract_game_info(filename)
+        if base_game and disc_num:
+            if base_game not in self.processed_games:
+                self.processed_games[base_game] = []
+            if disc_num not in self.processed_games[base_game]:
+                self.processed_games[base_game].append(disc_num)
+
     def analyze_archive(self, archive_path):
         """
         Analyze a .7z archive to estimate its size and complexity.
@@ -136,11 +203,16 @@ class Extractor:
         """
         archive_path = Path(archive_path)
 
+        try:
+            compressed_size = archive_path.stat().st_size
+        except OSError:
+            compressed_size = 0
+
         # Default analysis results
         analysis = {
             "path": archive_path,
             "size": 0,
-            "compressed_size": archive_path.stat().st_size if archive_path.exists() else 0,
+            "compressed_size": compressed_size,
             "file_count": 0,
             "largest_file": 0,
             "complexity": "unknown",
@@ -234,6 +306,8 @@ class Extractor:
 
             # Check if processing can be skipped (if all convertible files already exist as CHDs)
             if self.output_dir and analysis["has_disc_images"] and convertible_files:
+                # Remember the CHDs found here so they are registered without a second stat
+                existing_chds = []
                 can_skip = True
                 for filename in convertible_files:
                     # Get base name without extension
@@ -243,6 +317,7 @@ class Extractor:
                     if not chd_path.exists():
                         can_skip = False
                         break
+                    existing_chds.append(chd_path)
 
                 analysis["can_skip"] = can_skip
 
@@ -253,11 +328,10 @@ class Extractor:
 
                     # Register with PlaylistManager if available
                     if self.playlist_manager and base_game and disc_number:
-                        # Locate the CHD file and register it without updating playlists yet
-                        chd_pattern = f"{archive_path.stem}.chd"
-                        chd_path = self.output_dir / chd_pattern
-                        if chd_path.exists():
-                            self.playlist_manager.register_disc(chd_path, update_playlists=False)
+                        # Register the CHD files without updating playlists yet
+                        self.playlist_manager.register_multiple_discs(
+                            existing_chds, update_playlists=False
+                        )
                     # Legacy tracking
                     elif base_game and disc_number:
                         if base_game not in self.processed_games:
@@ -287,15 +361,26 @@ class Extractor:
         """
         Check available system resources.
 
+        Samples are reused for RESOURCE_SAMPLE_TTL seconds, since every archive checks
+        resources before extraction.
+
         Returns:
             dict: Available system resources including memory and CPU usage.
         """
+        now = time.monotonic()
+        sample = self._resource_sample
+        if sample and now - sample[0] < RESOURCE_SAMPLE_TTL:
+            return sample[1]
+
+        memory = psutil.virtual_memory()
         resources = {
-            "memory_available": psutil.virtual_memory().available,
-            "memory_percent": psutil.virtual_memory().percent,
-            "cpu_percent": psutil.cpu_percent(interval=0.1),
+            "memory_available": memory.available,
+            "memory_percent": memory.percent,
+            # CPU use since the previous call, without blocking to measure it
+            "cpu_percent": psutil.cpu_percent(interval=None),
             "disk_space": shutil.disk_usage(self.temp_dir).free,
         }
+        self._resource_sample = (now, resources)
 
         logger.debug(
             f"System resources: {resources['memory_percent']}% memory used, "
@@ -406,9 +491,26 @@ class Extractor:
                 resources = self.check_system_resources()
                 retry_count += 1
 
-            # Extract the archive
+            # Extract the archive, skipping members chdman will never read
             with py7zr.SevenZipFile(archive_path, mode="r") as z:
-                z.extractall(path=extract_dir)
+                file_info_list = z.list()
+                targets = self._select_extraction_targets(file_info_list)
+                if targets is None:
+                    z.extractall(path=extract_dir)
+                    targets = [
+                        file_info.filename
+                        for file_info in file_info_list
+                        if not file_info.is_directory
+                    ]
+                else:
+                    logger.debug(f"Extracting {len(targets)} disc image member(s) only")
+                    z.extract(path=extract_dir, targets=targets)
+
+            # The archive is read once per run, don't let it crowd out the page cache
+            drop_page_cache(archive_path)
+
+            # Remember what was written so identify_disc_files can skip rescanning it
+            self.extracted_files[extract_dir] = [extract_dir / name for name in targets]
 
             logger.info(f"Extraction successful: {archive_path}")
             return extract_dir
@@ -416,24 +518,72 @@ class Extractor:
         except py7zr.exceptions.Bad7zFile as e:
             logger.error(f"Corrupt or invalid 7z file {archive_path}: {e}")
             # Clean up the target directory if extraction failed
-            if extract_dir.exists():
-                shutil.rmtree(extract_dir)
+            self.cleanup_extracted_files(extract_dir)
             raise
 
         except MemoryError:
             logger.error(f"Memory error extracting {archive_path}, likely due to insufficient RAM")
             # Clean up the target directory if extraction failed
-            if extract_dir.exists():
-                shutil.rmtree(extract_dir)
+            self.cleanup_extracted_files(extract_dir)
             raise
 
         except Exception as e:
             logger.error(f"Failed to extract {archive_path}: {e}")
             # Clean up the target directory if extraction failed
-            if extract_dir.exists():
-                shutil.rmtree(extract_dir)
+            self.cleanup_extracted_files(extract_dir)
             raise
 
+    def cleanup_extracted_files(self, extract_dir):
+        """
+        Remove an extraction directory and forget its recorded file listing.
+
+        Args:
+            extract_dir (Path): Directory returned by extract_archive.
+        """
+        self.extracted_files.pop(Path(extract_dir), None)
+        shutil.rmtree(extract_dir, ignore_errors=True)
+
+    def _select_extraction_targets(self, file_info_list):
+        """
+        Select the archive members that need to be written to disk for conversion.
+
+        Archives containing a descriptor (.cue/.gdi/.toc) keep every member that could
+        be a track it references, since tracks may use any extension; only known extras
+        (readmes, scans, checksums) are dropped. Otherwise only standalone disc images
+        are extracted.
+
+        Args:
+            file_info_list (list): Member listing returned by SevenZipFile.list().
+
+        Returns:
+            list or None: Member names to extract, or None to extract everything.
+        """
+        files = [file_info for file_info in file_info_list if not file_info.is_directory]
+        names = [file_info.filename.lower() for file_info in files]
+
+        if any(name.endswith(DESCRIPTOR_EXTENSIONS) for name in names):
+            targets = [
+                file_info.filename
+                for file_info, name in zip(files, names)
+                if not name.endswith(EXTRA_EXTENSIONS)
+            ]
+        else:
+            targets = [
+                file_info.filename
+                for file_info, name in zip(files, names)
+                if name.endswith(IMAGE_EXTENSIONS)
+            ]
+
+        # Nothing recognisable, fall back to a full extraction
+        if not targets:
+            return None
+
+        # Nothing to skip, a plain extractall avoids the target filtering overhead
+        if len(targets) == len(file_info_list):
+            return None
+
+        return targets
+
     def extract_multiple(self, archive_paths, target_dir=None):
         """
         Extract multiple .7z archives with adaptive worker allocation and resume functionality.
@@ -607,20 +757,36 @@ class Extractor:
                 future_to_archive[future] = archive
 
             # Process results as they complete
-            for future in future_to_archive:
+            for future in as_completed(future_to_archive):
                 archive = future_to_archive[future]
                 try:
                     results[archive] = future.result()
-
-                    # Brief pause between completions to allow resource reclamation
-                    time.sleep(0.5)
-
                 except Exception as e:
                     logger.error(f"Extraction failed for {archive}: {e}")
                     results[archive] = None
 
         return results
 
+    def _scan_files(self, directory):
+        """
+        Recursively yield the files under a directory.
+
+        Uses os.scandir so file/directory checks come from the cached directory
+        entry instead of a separate stat per file.
+
+        Args:
+            directory (Path): Directory to scan.
+
+        Yields:
+            Path: Path of each regular file found.
+        """
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    yield from self._scan_files(entry.path)
+                elif entry.is_file():
+                    yield Path(entry.path)
+
     def identify_disc_files(self, directory):
         """
         Identify disc image files in a directory that can be converted to CHD.
@@ -649,103 +815,72 @@ class Extractor:
 
         logger.debug(f"Searching for disc files in {directory}")
 
-        # Create a dictionary to track cue files and their related bin files
-        cue_files = {}
+        # Track descriptor files (cue/gdi/toc) by directory; they reference the bin tracks
+        # next to them, so those bins must not be converted on their own
+        descriptor_files = {}
+        descriptor_dirs = set()
         bin_files = []
         other_files = []
 
+        # Reuse the archive listing from extract_archive when available instead of
+        # walking the directory py7zr just wrote
+        file_paths = self.extracted_files.pop(directory, None)
+        if file_paths is None:
+            file_paths = self._scan_files(directory)
+
         # First pass: categorize files
-        for root, _, files in os.walk(directory):
-            for file in files:
-                file_path = Path(root) / file
-                extension = file_path.suffix.lower()
-
-                if extension in supported_extensions:
-                    # Check if this file would already have a corresponding CHD in the output directory
-                    if self.output_dir:
-                        chd_path = self.output_dir / (file_path.stem + ".chd")
-                        if chd_path.exists():
-                            logger.debug(f"Skipping already converted file: {file_path}")
-
-                            # Register with PlaylistManager if available
-                            if self.playlist_manager:
-                                self.playlist_manager.register_disc(
-                                    chd_path, update_playlists=False
-                                )
-                            # Legacy tracking
-                            else:
-                                base_game, disc_num = self._extract_game_info(file_path.stem)
-                                if base_game and disc_num:
-                                    if base_game not in self.processed_games:
-                                        self.processed_games[base_game] = []
-                                    if disc_num not in self.processed_games[base_game]:
-                                        self.processed_games[base_game].append(disc_num)
-
-                            continue
-
-                    # Categorize by file type
-                    if extension == ".cue":
-                        # Store the cue file with its parent directory as key
-                        parent_dir = file_path.parent
-                        if parent_dir not in cue_files:
-                            cue_files[parent_dir] = []
-                        cue_files[parent_dir].append(file_path)
-                    elif extension == ".bin":
-                        bin_files.append(file_path)
-                    else:
-                        other_files.append((file_path, supported_extensions[extension]))
-
-        # Second pass: prioritize cue files over individual bin files
-        for parent_dir, cues in cue_files.items():
-            # Add all cue files
-            for cue_file in cues:
-                convertible_files.append((cue_file, "cue"))
-
-                # Register with PlaylistManager if available
-                base_game, disc_num = self._extract_game_info(cue_file.stem)
-                if base_game and disc_num:
-                    # We can't register the CHD yet as it doesn't exist, but we can track
-                    # the information for legacy compatibility
+        for file_path in file_paths:
+            extension = file_path.suffix.lower()
+
+            if extension not in supported_extensions:
+                continue
+
+            if extension in DESCRIPTOR_EXTENSIONS:
+                descriptor_dirs.add(file_path.parent)
+
+            # Check if this file would already have a corresponding CHD in the output directory
+            if self.output_dir:
+                chd_path = self.output_dir / (file_path.stem + ".chd")
+                if chd_path.exists():
+                    logger.debug(f"Skipping already converted file: {file_path}")
+
+                    # Register with PlaylistManager if available, else legacy tracking
                     if self.playlist_manager:
-                        # Will be handled during conversion
-                        pass
-                    # Legacy tracking
+                        self.playlist_manager.register_disc(chd_path, update_playlists=False)
                     else:
-                        if base_game not in self.processed_games:
-                            self.processed_games[base_game] = []
-                        if disc_num not in self.processed_games[base_game]:
-                            self.processed_games[base_game].append(disc_num)
+                        self._track_processed_game(file_path.stem)
+
+                    continue
 
-                logger.debug(f"Found cue file: {cue_file}")
+            # Categorize by file type
+            if extension in DESCRIPTOR_EXTENSIONS:
+                descriptor_files.setdefault(file_path.parent, []).append(
+                    (file_path, supported_extensions[extension])
+                )
+            elif extension == ".bin":
+                bin_files.append(file_path)
+            else:
+                other_files.append((file_path, supported_extensions[extension]))
+
+        # Second pass: prioritize descriptor files over individual bin files
+        for descriptors in descriptor_files.values():
+            for descriptor_file, file_type in descriptors:
+                convertible_files.append((descriptor_file, file_type))
 
-            # Track bin files that are in this directory to exclude them later
-            covered_bins = []
-            for bin_file in bin_files:
-                if bin_file.parent == parent_dir:
-                    covered_bins.append(bin_file)
+                # The CHD doesn't exist yet; PlaylistManager registration happens during conversion
+                self._track_processed_game(descriptor_file.stem)
 
-            # Remove covered bin files from the bin_files list
-            for bin_file in covered_bins:
-                bin_files.remove(bin_file)
+                logger.debug(f"Found {file_type} file: {descriptor_file}")
 
-        # Add remaining bin files that weren't covered by cue files
+        # Drop bin files that are tracks of a descriptor in the same directory
+        bin_files = [bin_file for bin_file in bin_files if bin_file.parent not in descriptor_dirs]
+
+        # Add remaining bin files that weren't covered by descriptor files
         for bin_file in bin_files:
             convertible_files.append((bin_file, "bin"))
 
             # Track for M3U creation
-            base_game, disc_num = self._extract_game_info(bin_file.stem)
-            if base_game and disc_num:
-                # We can't register the CHD yet as it doesn't exist, but we can track
-                # the information for legacy compatibility
-                if self.playlist_manager:
-                    # Will be handled during conversion
-                    pass
-                # Legacy tracking
-                else:
-                    if base_game not in self.processed_games:
-                        self.processed_games[base_game] = []
-                    if disc_num not in self.processed_games[base_game]:
-                        self.processed_games[base_game].append(disc_num)
+            self._track_processed_game(bin_file.stem)
 
             logger.debug(f"Found bin file (not covered by cue): {bin_file}")
 
@@ -754,19 +889,7 @@ class Extractor:
             convertible_files.append((file_path, file_type))
 
             # Track for M3U creation
-            base_game, disc_num = self._extract_game_info(file_path.stem)
-            if base_game and disc_num:
-                # We can't register the CHD yet as it doesn't exist, but we can track
-                # the information for legacy compatibility
-                if self.playlist_manager:
-                    # Will be handled during conversion
-                    pass
-                # Legacy tracking
-                else:
-                    if base_game not in self.processed_games:
-                        self.processed_games[base_game] = []
-                    if disc_num not in self.processed_games[base_game]:
-                        self.processed_games[base_game].append(disc_num)
+            self._track_processed_game(file_path.stem)
 
         logger.info(f"Found {len(convertible_files)} convertible files in {directory}")
         return convertible_files
@@ -800,11 +923,14 @@ class Extractor:
         """
         return self.completed_game_series
 
-    def process_archive_series(self):
+    def process_archive_series(self, base_games=None):
         """
         Process any completed series that need M3U files created.
         Called at appropriate intervals to ensure M3U files are created timely.
 
+        Args:
+            base_games (set, optional): Only check these series. Defaults to all tracked series.
+
         Returns:
             int: Number of series processed.
         """
@@ -819,6 +945,10 @@ class Extractor:
         # Legacy implementation
         # Check all game series to see if any are complete
         processed_games = self.get_processed_games()
+        if base_games is not None:
+            processed_games = {
+                game: processed_games[game] for game in base_games if game in processed_games
+            }
         for base_game, disc_numbers in processed_games.items():
             # Check if this is a multi-disc series that hasn't been processed yet
             if len(disc_numbers) >= 2 and base_game not in self.completed_game_series:
@@ -878,13 +1008,26 @@ class Extractor:
     def cleanup(self):
         """Clean up temporary files."""
         logger.info(f"Cleaning up temporary files in {self.temp_dir}")
+        self.extracted_files.clear()
 
         try:
-            if self.temp_dir.exists():
-                shutil.rmtree(self.temp_dir)
-            logger.info("Cleanup successful")
+            # Leftover extraction directories are removed concurrently; deleting
+            # many large images is bound on unlink latency, not CPU
+            with os.scandir(self.temp_dir) as entries:
+                subdirs = [entry.path for entry in entries if entry.is_dir()]
+            if len(subdirs) > 1:
+                with ThreadPoolExecutor(max_workers=min(8, len(subdirs))) as executor:
+                    for subdir in subdirs:
+                        executor.submit(shutil.rmtree, subdir, ignore_errors=True)
+
+            shutil.rmtree(self.temp_dir)
+        except FileNotFoundError:
+            pass  # Nothing left to remove
         except Exception as e:
             logger.error(f"Cleanup failed: {e}")
+            return
+
+        logger.info("Cleanup successful")
 
 
 # Main function for testing
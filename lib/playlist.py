@@ -12,14 +12,92 @@ import os
 import logging
 import re
 import json
+import threading
 from pathlib import Path
 from collections import defaultdict
 from datetime import datetime
+from functools import lru_cache
 from typing import Dict, List, Set, Tuple, Optional, Union
 
 # Set up logging
 logger = logging.getLogger("playlist")
 
+# Common disc identifier patterns (extended for better matching), tried in order
+DISC_PATTERNS = tuple(
+    re.compile(pattern)
+    for pattern in (
+        r"(?i)[\[(]?disc\s*(\d+)[\])]?",  # (Disc 1), [Disc 2], Disc 3
+        r"(?i)[\[(]?cd\s*(\d+)[\])]?",  # (CD 1), [CD 2], CD 3
+        r"(?i)[\[(]?disk\s*(\d+)[\])]?",  # (Disk 1), [Disk 2], Disk 3
+        r"(?i)[\[(]?volume\s*(\d+)[\])]?",  # (Volume 1), [Volume 2]
+        r"(?i)[\[(]?vol\s*(\d+)[\])]?",  # (Vol 1), [Vol 2]
+        r"(?i)[\[(]?d(\d+)[\])]?",  # (D1), [D2], D3
+        r"(?i)[\s\-\_\.]+d(\d+)[\s\-\_\.]?",  # Game - D1, Game_D2, Game.D3
+        r"(?i)[\s\-\_\.]+disc(\d+)[\s\-\_\.]?",  # Game - Disc1
+        r"(?i)[\s\-\_\.]+cd(\d+)[\s\-\_\.]?",  # Game - CD1
+        r"[\s\-\_\.]+(\d+)[\s\-\_\.]?",  # Game - 1, Game_2, Game.3
+    )
+)
+
+# Header line marking playlists written by this tool rather than by the user
+GENERATED_PLAYLIST_HEADER = "# Created by 7z-to-CHD Converter"
+
+# Disc number formats looked for after a known base name, tried in order
+RELATED_DISC_SUFFIXES = (
+    r".*disc\s*(\d+).*\.chd$",
+    r".*cd\s*(\d+).*\.chd$",
+    r".*disk\s*(\d+).*\.chd$",
+    r".*d(\d+).*\.chd$",
+)
+
+
+def _scan_chd_files(directory):
+    """Yield the CHD files directly inside a directory, using cached directory entries."""
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.name.endswith(".chd") and entry.is_file():
+                yield Path(entry.path)
+
+
+@lru_cache(maxsize=4096)
+def _parse_disc_name(filename, disc_patterns):
+    """Split a filename into (base_name, disc_number) using the first matching pattern."""
+    # Strip extension if present
+    name = Path(filename).stem
+
+    # Try to match disc patterns
+    for pattern in disc_patterns:
+        match = pattern.search(name)
+        if match:
+            disc_num = int(match.group(1))
+            # Remove the disc information from the name
+            base_name = pattern.sub("", name).strip(" -_.")
+
+            # Only clean the base name by removing disc/volume identifiers
+            # Do NOT remove region information or other parenthetical content
+            # This ensures region information is preserved in the M3U filename
+
+            return base_name, disc_num
+
+    # No disc pattern found
+    return name, None
+
+
+def _m3u_chd_entries(lines):
+    """Return the CHD entries of M3U playlist lines, skipping comments and blank lines."""
+    chd_files = []
+    for line in lines:
+        line = line.strip()
+        # Skip comments and empty lines
+        if not line or line.startswith("#"):
+            continue
+
+        # Only include CHD files
+        if line.lower().endswith(".chd"):
+            chd_files.append(line)
+
+    return chd_files
+
 
 class PlaylistManager:
     """
@@ -44,19 +122,8 @@ class PlaylistManager:
             output_dir: Output directory where CHD files and M3U playlists are stored
             state_file: Path to JSON file for persisting playlist state between sessions
         """
-        # Common disc identifier patterns (extended for better matching)
-        self.disc_patterns = [
-            r"(?i)[\[(]?disc\s*(\d+)[\])]?",  # (Disc 1), [Disc 2], Disc 3
-            r"(?i)[\[(]?cd\s*(\d+)[\])]?",  # (CD 1), [CD 2], CD 3
-            r"(?i)[\[(]?disk\s*(\d+)[\])]?",  # (Disk 1), [Disk 2], Disk 3
-            r"(?i)[\[(]?volume\s*(\d+)[\])]?",  # (Volume 1), [Volume 2]
-            r"(?i)[\[(]?vol\s*(\d+)[\])]?",  # (Vol 1), [Vol 2]
-            r"(?i)[\[(]?d(\d+)[\])]?",  # (D1), [D2], D3
-            r"(?i)[\s\-\_\.]+d(\d+)[\s\-\_\.]?",  # Game - D1, Game_D2, Game.D3
-            r"(?i)[\s\-\_\.]+disc(\d+)[\s\-\_\.]?",  # Game - Disc1
-            r"(?i)[\s\-\_\.]+cd(\d+)[\s\-\_\.]?",  # Game - CD1
-            r"[\s\-\_\.]+(\d+)[\s\-\_\.]?",  # Game - 1, Game_2, Game.3
-        ]
+        # Common disc identifier patterns, compiled once at module load
+        self.disc_patterns = DISC_PATTERNS
 
         # Initialize output directory
         self.output_dir = Path(output_dir) if output_dir else None
@@ -75,11 +142,19 @@ class PlaylistManager:
         )  # Maps base game name to list of (chd_path, disc_num) tuples
         self.created_playlists = set()  # Set of base game names for which M3Us have been created
         self.user_customized = set()  # Set of M3U files that contain user customizations
-        self.series_signatures = {}  # Maps base game name to signature (hash) of its disc set
+        self.series_signatures = {}  # Maps base game name to the disc set its M3U was written with
         self.recently_updated = (
             set()
         )  # Tracks series updated in current session to prevent redundant updates
 
+        # Guards state mutation when discs are registered from concurrent workers
+        self._lock = threading.RLock()
+
+        # CHD files in output_dir, listed on first use and refreshed by scan_directory.
+        # CHDs converted later in the session are registered directly, so they are
+        # never needed from the listing.
+        self._output_chds = None
+
         # Load state if available
         self._load_state()
 
@@ -93,6 +168,7 @@ class PlaylistManager:
             output_dir: Path to output directory
         """
         self.output_dir = Path(output_dir)
+        self._output_chds = None
 
         # Update state file path if not explicitly set
         if not self.state_file:
@@ -108,48 +184,57 @@ class PlaylistManager:
         Scan output directory for existing M3U files and analyze them for disc information.
         This helps integrate existing playlists into our state management.
         """
-        if not self.output_dir or not self.output_dir.exists():
+        if not self.output_dir:
             return
 
         logger.debug(f"Scanning for existing M3U playlists in {self.output_dir}")
 
-        for m3u_file in self.output_dir.glob("*.m3u"):
-            if m3u_file.is_file():
-                self.created_playlists.add(m3u_file.stem)
-
-                # Read the M3U file to extract disc information
-                try:
-                    chd_files = self._read_m3u_file(m3u_file)
-
-                    # Check if this M3U contains non-standard entries or comments that might indicate user customization
-                    with open(m3u_file, "r", encoding="utf-8", errors="ignore") as f:
-                        content = f.read()
-                        if "# Created by 7z-to-CHD Converter" not in content:
-                            # This might be a user-created or customized playlist
-                            self.user_customized.add(m3u_file.stem)
-                            logger.debug(f"Found potentially user-customized M3U: {m3u_file.name}")
-
-                        # Extract disc entries and add them to our game series tracking
-                        if chd_files and len(chd_files) > 1:
-                            # Try to determine base game name from filename
-                            base_game = m3u_file.stem
-
-                            # Process each file entry
-                            for chd_file in chd_files:
-                                chd_path = Path(chd_file)
-                                # Try to extract disc number from filename
-                                _, disc_num = self._extract_base_name_and_disc(chd_path.stem)
-
-                                # Only add if we could determine a disc number
-                                if disc_num:
-                                    self._add_to_game_series(base_game, chd_path, disc_num)
-
-                    logger.debug(
-                        f"Analyzed existing M3U: {m3u_file.name}, found {len(chd_files)} disc entries"
-                    )
+        try:
+            with os.scandir(self.output_dir) as entries:
+                m3u_files = [
+                    Path(entry.path)
+                    for entry in entries
+                    if entry.name.endswith(".m3u") and entry.is_file()
+                ]
+        except OSError:
+            return
 
-                except Exception as e:
-                    logger.warning(f"Error analyzing M3U file {m3u_file}: {e}")
+        for m3u_file in m3u_files:
+            self.created_playlists.add(m3u_file.stem)
+
+            # Read the M3U file once to extract disc information
+            try:
+                with open(m3u_file, "r", encoding="utf-8", errors="ignore") as f:
+                    content = f.read()
+                chd_files = _m3u_chd_entries(content.splitlines())
+
+                # Check if this M3U contains non-standard entries or comments that might indicate user customization
+                if GENERATED_PLAYLIST_HEADER not in content:
+                    # This might be a user-created or customized playlist
+                    self.user_customized.add(m3u_file.stem)
+                    logger.debug(f"Found potentially user-customized M3U: {m3u_file.name}")
+
+                # Extract disc entries and add them to our game series tracking
+                if chd_files and len(chd_files) > 1:
+                    # Try to determine base game name from filename
+                    base_game = m3u_file.stem
+
+                    # Process each file entry
+                    for chd_file in chd_files:
+                        chd_path = Path(chd_file)
+                        # Try to extract disc number from filename
+                        _, disc_num = self._extract_base_name_and_disc(chd_path.stem)
+
+                        # Only add if we could determine a disc number
+                        if disc_num:
+                            self._add_to_game_series(base_game, chd_path, disc_num)
+
+                logger.debug(
+                    f"Analyzed existing M3U: {m3u_file.name}, found {len(chd_files)} disc entries"
+                )
+
+            except Exception as e:
+                logger.warning(f"Error analyzing M3U file {m3u_file}: {e}")
 
     def _read_m3u_file(self, m3u_path: Path) -> List[str]:
         """
@@ -161,20 +246,9 @@ class PlaylistManager:
         Returns:
             List of CHD filenames or paths found in the M3U
         """
-        chd_files = []
         try:
             with open(m3u_path, "r", encoding="utf-8", errors="ignore") as f:
-                for line in f:
-                    line = line.strip()
-                    # Skip comments and empty lines
-                    if not line or line.startswith("#"):
-                        continue
-
-                    # Only include CHD files
-                    if line.lower().endswith(".chd"):
-                        chd_files.append(line)
-
-            return chd_files
+                return _m3u_chd_entries(f)
 
         except Exception as e:
             logger.error(f"Error reading M3U file {m3u_path}: {e}")
@@ -191,6 +265,16 @@ class PlaylistManager:
             logger.debug("No state file path defined, skipping state save")
             return False
 
+        with self._lock:
+            return self._write_state()
+
+    def _write_state(self) -> bool:
+        """
+        Serialize the current playlist state to the state file. Callers must hold the state lock.
+
+        Returns:
+            True if state was successfully saved, False otherwise
+        """
         try:
             # Create serializable versions of state dictionaries
             serializable_state = {
@@ -235,7 +319,9 @@ class PlaylistManager:
 
             # Restore game series data
             for game, disc_list in state_data.get("game_series", {}).items():
-                self.game_series[game] = [(Path(path), disc_num) for path, disc_num in disc_list]
+                self.game_series[game] = sorted(
+                    ((Path(path), disc_num) for path, disc_num in disc_list), key=lambda x: x[1]
+                )
 
             # Restore set data
             self.created_playlists = set(state_data.get("created_playlists", []))
@@ -269,25 +355,8 @@ class PlaylistManager:
         Returns:
             Tuple of (base_game_name, disc_number) or (filename, None) if no disc pattern found
         """
-        # Strip extension if present
-        name = Path(filename).stem
-
-        # Try to match disc patterns
-        for pattern in self.disc_patterns:
-            match = re.search(pattern, name)
-            if match:
-                disc_num = int(match.group(1))
-                # Remove the disc information from the name
-                base_name = re.sub(pattern, "", name).strip(" -_.")
-
-                # Only clean the base name by removing disc/volume identifiers
-                # Do NOT remove region information or other parenthetical content
-                # This ensures region information is preserved in the M3U filename
-
-                return base_name, disc_num
-
-        # No disc pattern found
-        return name, None
+        # The same stems are parsed on registration and again by every directory scan
+        return _parse_disc_name(filename, tuple(self.disc_patterns))
 
     def _clean_filename(self, name: str) -> str:
         """
@@ -310,27 +379,25 @@ class PlaylistManager:
             file_path: Path to the CHD file
             disc_num: Disc number
         """
-        # Check if this exact disc is already tracked
-        for existing_path, existing_num in self.game_series[base_game]:
+        disc_list = self.game_series[base_game]
+
+        # Check if this exact disc is already tracked, noting where it belongs by disc number
+        insert_at = len(disc_list)
+        for index, (existing_path, existing_num) in enumerate(disc_list):
             if existing_path == file_path or existing_num == disc_num:
                 # Already tracking this disc
                 return
+            if existing_num > disc_num and insert_at == len(disc_list):
+                insert_at = index
 
-        # Add new disc to tracking
-        self.game_series[base_game].append((file_path, disc_num))
-
-        # Sort disc list by disc number for consistent ordering
-        self.game_series[base_game].sort(key=lambda x: x[1])
-
-        # Update the series signature to track changes
-        self._update_series_signature(base_game)
+        # Insert in place so the list stays ordered by disc number without re-sorting
+        disc_list.insert(insert_at, (file_path, disc_num))
 
         logger.debug(f"Added disc {disc_num} to game series '{base_game}'")
 
-    def _update_series_signature(self, base_game: str) -> str:
+    def _series_signature(self, base_game: str) -> str:
         """
-        Update the signature (hash) for a game series based on its current disc set.
-        This is used to detect changes in the disc set for efficient playlist updates.
+        Build the signature for a game series from its current disc set.
 
         Args:
             base_game: Base name of the game
@@ -341,15 +408,24 @@ class PlaylistManager:
         if base_game not in self.game_series:
             return ""
 
-        # Create a signature based on sorted disc numbers and filenames
-        disc_info = sorted(
-            [(disc_num, path.name) for path, disc_num in self.game_series[base_game]]
+        # Create a signature based on disc numbers and filenames (kept in disc order)
+        return ":".join(
+            [f"{disc_num}:{path.name}" for path, disc_num in self.game_series[base_game]]
         )
-        signature = ":".join([f"{num}:{name}" for num, name in disc_info])
 
-        # Store the signature
-        self.series_signatures[base_game] = signature
+    def _update_series_signature(self, base_game: str) -> str:
+        """
+        Record the current disc set of a game series as the one its playlist was written with.
+        This is used to detect changes in the disc set for efficient playlist updates.
 
+        Args:
+            base_game: Base name of the game
+
+        Returns:
+            String signature representing the current disc set
+        """
+        signature = self._series_signature(base_game)
+        self.series_signatures[base_game] = signature
         return signature
 
     def has_series_changed(self, base_game: str) -> bool:
@@ -375,19 +451,12 @@ class PlaylistManager:
         Returns:
             True if the series has changed, False otherwise
         """
-        # If this series was recently updated in this session, no need to update again
-        if base_game in self.recently_updated:
-            return False
-
         # If we have no previous signature, consider it changed
         if base_game not in self.series_signatures:
             return True
 
-        # Get the current signature
-        current_signature = self._update_series_signature(base_game)
-
-        # Compare with the stored signature
-        return current_signature != self.series_signatures.get(base_game, "")
+        # Compare the current disc set with the one the playlist was last written with
+        return self._series_signature(base_game) != self.series_signatures[base_game]
 
     def register_disc(
         self, chd_path: Union[str, Path], update_playlists: bool = True
@@ -415,6 +484,25 @@ class PlaylistManager:
             )
             return None
 
+        with self._lock:
+            return self._register_series_disc(base_game, chd_path, disc_num, update_playlists)
+
+    def _register_series_disc(
+        self, base_game: str, chd_path: Path, disc_num: int, update_playlists: bool
+    ) -> str:
+        """
+        Track a disc belonging to a series and refresh its playlist if needed.
+        Callers must hold the state lock.
+
+        Args:
+            base_game: Base name of the game
+            chd_path: Path to CHD file
+            disc_num: Disc number
+            update_playlists: Whether to automatically update playlists after registration
+
+        Returns:
+            Base game name
+        """
         # Add to game series tracking
         self._add_to_game_series(base_game, chd_path, disc_num)
 
@@ -449,33 +537,34 @@ class PlaylistManager:
         Args:
             base_game: Base name of the game
         """
-        if not self.output_dir or not self.output_dir.exists():
+        if not self.output_dir:
             return
 
-        # Standardize the base_game for pattern matching
-        # Create pattern to match various disc number formats
-        pattern_base = (
-            base_game.replace("(", r"\(")
-            .replace(")", r"\)")
-            .replace("[", r"\[")
-            .replace("]", r"\]")
-        )
+        # One listing serves every registration instead of a directory scan per disc
+        if self._output_chds is None:
+            try:
+                self._output_chds = list(_scan_chd_files(self.output_dir))
+            except OSError:
+                return
 
-        # Patterns to match disc identifiers in filenames
+        # Create patterns to match various disc number formats after the literal base name
+        pattern_base = re.escape(base_game)
         patterns = [
-            f"{pattern_base}.*disc\\s*(\\d+).*\\.chd$",
-            f"{pattern_base}.*cd\\s*(\\d+).*\\.chd$",
-            f"{pattern_base}.*disk\\s*(\\d+).*\\.chd$",
-            f"{pattern_base}.*d(\\d+).*\\.chd$",
+            re.compile(pattern_base + suffix, re.IGNORECASE) for suffix in RELATED_DISC_SUFFIXES
         ]
+        base_lower = base_game.lower()
 
         # Track what we've found
         found_discs = set()
 
-        # Search for matching CHD files
-        for chd_file in self.output_dir.glob("*.chd"):
+        # Search for matching CHD files; this runs on every registration, so most
+        # files are rejected with a substring check before any pattern is tried
+        for chd_file in self._output_chds:
+            if base_lower not in chd_file.name.lower():
+                continue
+
             for pattern in patterns:
-                match = re.search(pattern, chd_file.name, re.IGNORECASE)
+                match = pattern.search(chd_file.name)
                 if match:
                     disc_num = int(match.group(1))
 
@@ -512,29 +601,38 @@ class PlaylistManager:
         Returns:
             Dictionary mapping base game names to number of discs registered
         """
-        # Group files by base game to process efficiently
+        # Group files by base game to process efficiently; files without a disc
+        # number are not part of a multi-disc series
         game_groups = defaultdict(list)
-        nondisc_files = []
-
-        # First pass: group files by game series
         for chd_path in chd_paths:
             path = Path(chd_path)
             base_game, disc_num = self._extract_base_name_and_disc(path.stem)
 
             if disc_num:
                 game_groups[base_game].append((path, disc_num))
-            else:
-                nondisc_files.append(path)
 
+        with self._lock:
+            return self._register_series_groups(game_groups, update_playlists)
+
+    def _register_series_groups(
+        self, game_groups: Dict[str, List[Tuple[Path, int]]], update_playlists: bool
+    ) -> Dict[str, int]:
+        """
+        Track grouped discs and refresh the affected playlists.
+        Callers must hold the state lock.
+
+        Args:
+            game_groups: Mapping of base game names to their (chd_path, disc_num) tuples
+            update_playlists: Whether to automatically update playlists after registration
+
+        Returns:
+            Dictionary mapping base game names to number of discs registered
+        """
         # Track registered games and disc counts
         registered_games = defaultdict(int)
 
         # Process each game series
         for base_game, discs in game_groups.items():
-            # Reset the series signature to force update
-            if base_game in self.series_signatures:
-                del self.series_signatures[base_game]
-
             # Add all discs for this game series
             for path, disc_num in discs:
                 self._add_to_game_series(base_game, path, disc_num)
@@ -558,14 +656,6 @@ class PlaylistManager:
                     )
                     self.update_playlist(base_game)
 
-        # Process non-disc files individually (unlikely to be part of series)
-        for path in nondisc_files:
-            # These shouldn't be part of series, but process them for completeness
-            base_game, disc_num = self._extract_base_name_and_disc(path.stem)
-            if disc_num:  # Just in case our earlier logic missed something
-                self._add_to_game_series(base_game, path, disc_num)
-                registered_games[base_game] += 1
-
         # Save state
         self._save_state()
 
@@ -596,7 +686,11 @@ class PlaylistManager:
         m3u_path = self.output_dir / f"{clean_name}.m3u"
 
         # If the playlist already exists, check if it needs updating
-        if m3u_path.exists() and not self._has_series_changed(base_game):
+        if (
+            m3u_path.exists()
+            and not self._has_series_changed(base_game)
+            and not self._is_outdated_playlist(base_game, m3u_path)
+        ):
             logger.debug(f"Skipping playlist update for {base_game} - no changes detected")
             return m3u_path
 
@@ -607,12 +701,39 @@ class PlaylistManager:
             # Create or fully update the playlist
             result = self._create_standard_playlist(base_game, m3u_path)
 
-        # Mark as recently updated to prevent redundant updates
+        # Remember the disc set just written so unchanged series are skipped next time
         if result:
+            self._update_series_signature(base_game)
             self.recently_updated.add(base_game)
 
         return result
 
+    def _is_outdated_playlist(self, base_game: str, m3u_path: Path) -> bool:
+        """
+        Check if a generated playlist lists fewer readable discs than the series has.
+        Playlists from older versions appended " # Disc N" to each entry, which
+        emulators read as part of the filename; their stored signatures still match
+        the disc set, so they have to be recognised from the file itself.
+
+        Args:
+            base_game: Base name of the game series
+            m3u_path: Path to the existing M3U file
+
+        Returns:
+            True if the playlist was generated by this tool and needs rewriting
+        """
+        try:
+            with open(m3u_path, "r", encoding="utf-8", errors="ignore") as f:
+                content = f.read()
+        except OSError:
+            return True
+
+        # Playlists written by the user are never rewritten here
+        if GENERATED_PLAYLIST_HEADER not in content:
+            return False
+
+        return len(_m3u_chd_entries(content.splitlines())) < len(self.game_series[base_game])
+
     def _update_user_customized_playlist(self, base_game: str, m3u_path: Path) -> Path:
         """
         Update a user-customized playlist by appending new discs while preserving modifications.
@@ -648,17 +769,22 @@ class PlaylistManager:
             shutil.copy2(m3u_path, backup_path)
             logger.debug(f"Created backup of user-customized playlist: {backup_path}")
 
-            # Append new entries to the existing file
-            with open(m3u_path, "a", encoding="utf-8") as f:
-                f.write("\n# New entries added by 7z-to-CHD Converter\n")
-                f.write(f"# Added on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+            # Append new entries to the existing file in one write; game_series is kept
+            # in disc order, so new_entries already is
+            lines = [
+                "",
+                "# New entries added by 7z-to-CHD Converter",
+                f"# Added on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+            ]
+            for chd_path, disc_num in new_entries:
+                # Use relative path if file is in the same directory
+                if chd_path.parent == self.output_dir:
+                    lines.append(chd_path.name)
+                else:
+                    lines.append(str(chd_path))
 
-                for chd_path, disc_num in sorted(new_entries, key=lambda x: x[1]):
-                    # Use relative path if file is in the same directory
-                    if chd_path.parent == self.output_dir:
-                        f.write(f"{chd_path.name}\n")
-                    else:
-                        f.write(f"{chd_path}\n")
+            with open(m3u_path, "a", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
 
             logger.info(
                 f"Updated user-customized playlist {m3u_path} with {len(new_entries)} new discs"
@@ -688,8 +814,8 @@ class PlaylistManager:
             # Create directory if it doesn't exist
             os.makedirs(m3u_path.parent, exist_ok=True)
 
-            # Sort discs by disc number
-            sorted_discs = sorted(self.game_series[base_game], key=lambda x: x[1])
+            # Discs are kept ordered by disc number as they are added
+            sorted_discs = self.game_series[base_game]
 
             # Get disc information for logging
             disc_nums = [disc_num for _, disc_num in sorted_discs]
@@ -707,23 +833,26 @@ class PlaylistManager:
                     f"Creating playlist for {base_game} with missing disc(s): {missing_str}"
                 )
 
-            with open(m3u_path, "w", encoding="utf-8") as f:
-                # Write header comment with metadata
-                f.write(f"# {base_game} - Multi-disc game playlist\n")
-                f.write("# Created by 7z-to-CHD Converter\n")
-                f.write(f"# Last updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                f.write(f"# Total discs: {len(sorted_discs)} ({', '.join(map(str, disc_nums))})\n")
-                if missing_discs:
-                    f.write(f"# Missing discs: {', '.join(map(str, sorted(missing_discs)))}\n")
-                f.write("#\n")
-
-                # Write disc entries
-                for chd_path, disc_num in sorted_discs:
-                    # Use relative path if file is in the same directory
-                    if chd_path.parent == self.output_dir:
-                        f.write(f"{chd_path.name} # Disc {disc_num}\n")
-                    else:
-                        f.write(f"{chd_path} # Disc {disc_num}\n")
+            # Header comment with metadata
+            lines = [
+                f"# {base_game} - Multi-disc game playlist",
+                GENERATED_PLAYLIST_HEADER,
+                f"# Last updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+                f"# Total discs: {len(sorted_discs)} ({', '.join(map(str, disc_nums))})",
+            ]
+            if missing_discs:
+                lines.append(f"# Missing discs: {', '.join(map(str, sorted(missing_discs)))}")
+            lines.append("#")
+
+            # Disc entries must be bare paths; emulators read the whole line as the filename
+            for chd_path, _ in sorted_discs:
+                # Use relative path if file is in the same directory
+                if chd_path.parent == self.output_dir:
+                    lines.append(chd_path.name)
+                else:
+                    lines.append(str(chd_path))
+
+            m3u_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
 
             # Mark as created
             clean_name = self._clean_filename(base_game)
@@ -764,8 +893,10 @@ class PlaylistManager:
         self.recently_updated = set()
 
         # Get all CHD files
-        chd_files = list(scan_dir.glob("*.chd"))  # Only scan top level, not recursively
+        chd_files = list(_scan_chd_files(scan_dir))  # Only scan top level, not recursively
         logger.debug(f"Found {len(chd_files)} CHD files")
+        if scan_dir == self.output_dir:
+            self._output_chds = chd_files
 
         # Group CHD files by potential series to avoid processing one at a time
         # This reduces the number of times we update playlists
@@ -779,10 +910,6 @@ class PlaylistManager:
 
         # Process each series
         for base_game, discs in series_groups.items():
-            # Reset the series signature to force a fresh comparison
-            if base_game in self.series_signatures:
-                del self.series_signatures[base_game]
-
             for chd_file, disc_num in discs:
                 self._add_to_game_series(base_game, chd_file, disc_num)
 
@@ -847,7 +974,7 @@ class PlaylistManager:
             # Only process if we have enough discs
             if len(disc_list) >= min_discs:
                 # Check if we have reasonable disc sequence
-                disc_nums = sorted([disc_num for _, disc_num in disc_list])
+                disc_nums = [disc_num for _, disc_num in disc_list]
 
                 # Check if the highest disc number is reasonable
                 max_disc = max(disc_nums)
@@ -888,7 +1015,7 @@ class PlaylistManager:
         status = {}
 
         for base_game, disc_list in self.game_series.items():
-            disc_nums = sorted([disc_num for _, disc_num in disc_list])
+            disc_nums = [disc_num for _, disc_num in disc_list]
             clean_name = self._clean_filename(base_game)
 
             # Check if this series has a playlist
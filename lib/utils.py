@@ -9,8 +9,12 @@ Repository: https://github.com/AKSDug/7z-to-chd
 """
 
 import os
+import stat
 import sys
+import atexit
 import logging
+import logging.handlers
+import queue
 import time
 from pathlib import Path
 from datetime import datetime
@@ -19,6 +23,9 @@ from datetime import datetime
 DEFAULT_LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 DEFAULT_LOG_LEVEL = logging.INFO
 
+# Listener thread that writes queued log records, see setup_logging()
+_log_listener = None
+
 
 def setup_logging(log_dir=None, log_level=DEFAULT_LOG_LEVEL, console=True):
     """
@@ -32,6 +39,8 @@ def setup_logging(log_dir=None, log_level=DEFAULT_LOG_LEVEL, console=True):
     Returns:
         logging.Logger: Configured root logger.
     """
+    global _log_listener
+
     # Create timestamp for log file
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
@@ -51,20 +60,30 @@ def setup_logging(log_dir=None, log_level=DEFAULT_LOG_LEVEL, console=True):
     # Remove existing handlers
     for handler in root_logger.handlers[:]:
         root_logger.removeHandler(handler)
+    _stop_log_listener()
+
+    handlers = []
 
     # Create a file handler
     log_file = log_dir / f"7z-to-chd_{timestamp}.log"
     file_handler = logging.FileHandler(log_file, encoding="utf-8")
     file_handler.setLevel(log_level)
     file_handler.setFormatter(logging.Formatter(DEFAULT_LOG_FORMAT))
-    root_logger.addHandler(file_handler)
+    handlers.append(file_handler)
 
     # Create a console handler if requested
     if console:
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setLevel(log_level)
         console_handler.setFormatter(logging.Formatter("%(levelname)s: %(message)s"))
-        root_logger.addHandler(console_handler)
+        handlers.append(console_handler)
+
+    # Worker threads only enqueue records; a single listener thread does the file and
+    # console writes, so workers never contend on stream locks or interleave output
+    log_queue = queue.Queue(-1)
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    _log_listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _log_listener.start()
 
     # Log basic information
     logger = logging.getLogger("utils")
@@ -73,6 +92,19 @@ def setup_logging(log_dir=None, log_level=DEFAULT_LOG_LEVEL, console=True):
     return root_logger
 
 
+def _stop_log_listener():
+    """Flush and stop the logging listener thread, if one is running."""
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        for handler in _log_listener.handlers:
+            handler.close()
+        _log_listener = None
+
+
+atexit.register(_stop_log_listener)
+
+
 def format_time(seconds):
     """
     Format time in seconds to a human-readable string.
@@ -182,3 +214,51 @@ def confirm_path(path, create=False, is_file=False):
             raise FileNotFoundError(f"Directory does not exist: {path}")
 
         return path
+
+
+def is_nonempty_file(path):
+    """
+    Check whether a path is an existing file with content.
+
+    Used to decide whether an output CHD can be reused; a zero-byte file left
+    behind by an interrupted conversion does not count.
+
+    Args:
+        path (str): Path to check.
+
+    Returns:
+        bool: True if the path is a regular file larger than zero bytes.
+    """
+    try:
+        stat_result = os.stat(path)
+    except OSError:
+        return False
+
+    return stat.S_ISREG(stat_result.st_mode) and stat_result.st_size > 0
+
+
+def drop_page_cache(path):
+    """
+    Advise the kernel that a file's cached pages will not be read again.
+
+    Batch conversions stream through many gigabytes of archives and CHDs that are
+    each touched once; dropping them keeps the page cache for useful data. This is
+    purely advisory and a no-op where posix_fadvise is unavailable (Windows, macOS).
+
+    Args:
+        path (str): Path to the file.
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return
+
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
@@ -8,7 +8,7 @@ from unittest.mock import patch, MagicMock
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from convert import prompt_user_input
+from convert import prompt_user_input, find_7z_files
 
 
 class TestPromptUserInput:
@@ -124,4 +124,21 @@ class TestPromptUserInput:
             result = prompt_user_input(args)
             source_dir, dest_dir, keep_files, max_workers, state_file, skip_playlist_scan = result
             
-            assert keep_files is False, "Command line --keep no should delete files"
\ No newline at end of file
+            assert keep_files is False, "Command line --keep no should delete files"
+
+
+class TestFind7zFiles:
+    """Test archive discovery."""
+
+    def test_finds_archives_recursively(self, tmp_path):
+        """Test that .7z files are found in subdirectories regardless of case."""
+        (tmp_path / "sub" / "deeper").mkdir(parents=True)
+        (tmp_path / "a.7z").write_bytes(b"")
+        (tmp_path / "sub" / "b.7Z").write_bytes(b"")
+        (tmp_path / "sub" / "deeper" / "c.7z").write_bytes(b"")
+        (tmp_path / "sub" / "notes.txt").write_bytes(b"")
+        (tmp_path / "folder.7z").mkdir()
+
+        found = sorted(path.relative_to(tmp_path).as_posix() for path in find_7z_files(tmp_path))
+
+        assert found == ["a.7z", "sub/b.7Z", "sub/deeper/c.7z"]
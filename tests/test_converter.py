@@ -0,0 +1,226 @@
+"""Test converter functionality."""
+
+import os
+import pytest
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import lib.converter as converter_module
+from lib.converter import Converter
+from lib.extractor import Extractor
+from lib.playlist import PlaylistManager
+
+pytestmark = pytest.mark.skipif(os.name == "nt", reason="fake chdman is a shell script")
+
+FAKE_CHDMAN = """#!/bin/sh
+out=""
+while [ $# -gt 0 ]; do
+    case "$1" in -o) out="$2"; shift;; esac
+    shift
+done
+echo "Compressing, 50.0% complete..."
+if [ -n "$FAIL" ]; then
+    echo "Error: unsupported input" >&2
+    exit 1
+fi
+echo chd > "$out"
+echo "Compression complete ... final ratio = 50.0%"
+"""
+
+
+@pytest.fixture
+def workdir():
+    """Temporary directory containing a fake chdman and a disc image."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_dir = Path(temp_dir)
+        chdman = temp_dir / "chdman"
+        chdman.write_text(FAKE_CHDMAN)
+        chdman.chmod(0o755)
+        (temp_dir / "Game.iso").write_bytes(b"\0" * 2048)
+        yield temp_dir
+
+
+class TestFindChdman:
+    """Test chdman discovery."""
+
+    def test_search_runs_once(self, workdir, monkeypatch):
+        """Test that later converters reuse the chdman found by the first."""
+        searches = []
+        monkeypatch.setattr(Converter, "_chdman_cache", None)
+        monkeypatch.setattr(
+            Converter, "_search_chdman", lambda self: searches.append(1) or workdir / "chdman"
+        )
+
+        paths = [Converter(max_workers=1).chdman_path for _ in range(2)]
+
+        assert paths == [workdir / "chdman"] * 2
+        assert len(searches) == 1
+
+
+class TestCheckConversionTools:
+    """Test the chdman health check."""
+
+    def test_check_runs_once(self, workdir, monkeypatch):
+        """Test that a working chdman is only run the first time it is checked."""
+        runs = []
+        run = subprocess.run
+        monkeypatch.setattr(subprocess, "run", lambda *a, **kw: runs.append(a) or run(*a, **kw))
+        converter = Converter(max_workers=1, chdman_path=workdir / "chdman")
+
+        assert converter.check_conversion_tools() is True
+        assert converter.check_conversion_tools() is True
+        assert len(runs) == 1
+
+
+class TestConvertToChd:
+    """Test single file conversion."""
+
+    def test_successful_conversion(self, workdir):
+        """Test that a zero exit status yields the CHD path."""
+        converter = Converter(max_workers=1, chdman_path=workdir / "chdman")
+        output_file, success = converter.convert_to_chd(workdir / "Game.iso", workdir / "out")
+
+        assert success is True
+        assert output_file == workdir / "out" / "Game.chd"
+        assert output_file.exists()
+
+    def test_existing_chd_skipped_unless_empty(self, workdir):
+        """Test that an existing CHD is kept but an empty leftover is converted again."""
+        (workdir / "Other.iso").write_bytes(b"\0" * 2048)
+        (workdir / "Game.chd").write_bytes(b"existing")
+        (workdir / "Other.chd").write_bytes(b"")
+        converter = Converter(max_workers=1, chdman_path=workdir / "chdman")
+
+        assert converter.convert_to_chd(workdir / "Game.iso") == (workdir / "Game.chd", True)
+        assert converter.convert_to_chd(workdir / "Other.iso") == (workdir / "Other.chd", True)
+        assert (workdir / "Game.chd").read_bytes() == b"existing"
+        assert (workdir / "Other.chd").read_text() == "chd\n"
+
+    def test_failed_conversion(self, workdir, monkeypatch, caplog):
+        """Test that a failing chdman is reported with its output."""
+        monkeypatch.setenv("FAIL", "1")
+        converter = Converter(max_workers=1, chdman_path=workdir / "chdman")
+        output_file, success = converter.convert_to_chd(workdir / "Game.iso", workdir / "out")
+
+        assert (output_file, success) == (None, False)
+        assert "unsupported input" in caplog.text
+
+    def test_shares_cores_between_chdman_processes(self, workdir, monkeypatch):
+        """Test that chdman is told how many cores it may use."""
+        commands = []
+        monkeypatch.setattr(os, "cpu_count", lambda: 8)
+        converter = Converter(max_workers=2, chdman_path=workdir / "chdman")
+        monkeypatch.setattr(
+            converter, "_stream_chdman", lambda command, tail: commands.append(command) or 0
+        )
+
+        converter._active_chdman = 1  # Another conversion is already running
+        converter._run_chdman(["chdman", "createcd"])
+
+        assert commands == [["chdman", "createcd", "-np", "4"]]
+        assert converter._active_chdman == 1
+
+    def test_dvd_iso_uses_createdvd(self, workdir, monkeypatch):
+        """Test that ISOs too large for a CD are converted as DVDs."""
+        commands = []
+        monkeypatch.setattr(converter_module, "DVD_ISO_MIN_SIZE", 1024)
+        (workdir / "Small.iso").write_bytes(b"\0" * 1024)
+        converter = Converter(max_workers=1, chdman_path=workdir / "chdman")
+        monkeypatch.setattr(
+            converter, "_stream_chdman", lambda command, tail: commands.append(command) or 0
+        )
+
+        converter.convert_to_chd(workdir / "Game.iso", workdir / "out")
+        converter.convert_to_chd(workdir / "Small.iso", workdir / "out")
+
+        assert [command[1] for command in commands] == ["createdvd", "createcd"]
+
+
+class TestConvertMultiple:
+    """Test multi-disc conversion."""
+
+    def test_pool_starts_on_first_use(self, workdir):
+        """Test that the conversion pool is only started by convert_multiple."""
+        converter = Converter(max_workers=1, chdman_path=workdir / "chdman")
+        assert converter._executor is None
+
+        converter.convert_multiple([(workdir / "Game.iso", "iso")], workdir / "out")
+        assert converter._executor is not None
+
+        converter.cleanup()
+        assert converter._executor is None
+
+    def test_converts_every_disc(self, workdir):
+        """Test that all discs convert when workers are fewer than discs."""
+        (workdir / "Game (Disc 2).iso").write_bytes(b"\0" * 2048)
+        converter = Converter(max_workers=1, chdman_path=workdir / "chdman")
+
+        results = converter.convert_multiple(
+            [(workdir / "Game.iso", "iso"), (workdir / "Game (Disc 2).iso", "iso")], workdir / "out"
+        )
+        converter.cleanup()
+
+        assert all(success for _, success in results.values())
+        assert sorted(path.name for path, _ in results.values()) == [
+            "Game (Disc 2).chd",
+            "Game.chd",
+        ]
+
+    def test_registers_discs_after_conversion(self, workdir):
+        """Test that converted discs are registered with the playlist manager in one pass."""
+        for disc in (1, 2):
+            (workdir / f"Game (Disc {disc}).iso").write_bytes(b"\0" * 2048)
+        converter = Converter(max_workers=2, chdman_path=workdir / "chdman")
+        converter.set_playlist_manager(PlaylistManager(output_dir=workdir / "out"))
+
+        converter.convert_multiple(
+            [(workdir / f"Game (Disc {disc}).iso", "iso") for disc in (1, 2)], workdir / "out"
+        )
+        converter.cleanup()
+
+        assert (workdir / "out" / "Game.m3u").exists()
+        assert [d for _, d in converter.playlist_manager.game_series["Game"]] == [1, 2]
+
+    def test_existing_chd_not_submitted(self, workdir, monkeypatch):
+        """Test that discs already converted are skipped without using the pool."""
+        (workdir / "Game (Disc 2).iso").write_bytes(b"\0" * 2048)
+        (workdir / "out").mkdir()
+        (workdir / "out" / "Game.chd").write_bytes(b"existing")
+        converter = Converter(max_workers=1, chdman_path=workdir / "chdman")
+        submitted = []
+        convert_to_chd = converter.convert_to_chd
+        monkeypatch.setattr(
+            converter,
+            "convert_to_chd",
+            lambda path, *a, **kw: submitted.append(path.name) or convert_to_chd(path, *a, **kw),
+        )
+
+        results = converter.convert_multiple(
+            [(workdir / "Game.iso", "iso"), (workdir / "Game (Disc 2).iso", "iso")], workdir / "out"
+        )
+        converter.cleanup()
+
+        assert submitted == ["Game (Disc 2).iso"]
+        assert results[workdir / "Game.iso"] == (workdir / "out" / "Game.chd", True)
+        assert (workdir / "out" / "Game.chd").read_bytes() == b"existing"
+
+    def test_legacy_tracking_checks_converted_series(self, workdir):
+        """Test that without a playlist manager only this call's series are checked."""
+        for disc in (1, 2):
+            (workdir / f"Game (Disc {disc}).iso").write_bytes(b"\0" * 2048)
+        extractor = Extractor(temp_dir=workdir / "work", max_workers=1)
+        extractor.processed_games["Other"] = [1, 2]
+        converter = Converter(max_workers=1, chdman_path=workdir / "chdman")
+        converter.set_extractor(extractor)
+
+        converter.convert_multiple(
+            [(workdir / f"Game (Disc {disc}).iso", "iso") for disc in (1, 2)], workdir / "out"
+        )
+        converter.cleanup()
+
+        assert extractor.completed_game_series == {"Game"}
@@ -0,0 +1,205 @@
+"""Test extractor functionality."""
+
+import pytest
+import sys
+import tempfile
+from pathlib import Path
+
+import psutil
+import py7zr
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from lib.extractor import Extractor
+from lib.playlist import PlaylistManager
+
+
+def make_archive(archive_path, members):
+    """Create a .7z archive containing the given {name: bytes} members."""
+    with py7zr.SevenZipFile(archive_path, mode="w") as z:
+        for name, data in members.items():
+            z.writestr(data, name)
+    return archive_path
+
+
+class TestExtractArchive:
+    """Test archive extraction."""
+
+    def test_extracts_only_disc_images(self):
+        """Test that extras next to a standalone image are not written to disk."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_dir = Path(temp_dir)
+            archive = make_archive(
+                temp_dir / "Game.7z",
+                {"Game.iso": b"\0" * 2048, "readme.txt": b"hello", "cover.jpg": b"jpg"},
+            )
+
+            extractor = Extractor(temp_dir=temp_dir / "work", max_workers=1)
+            extract_dir = extractor.extract_archive(archive)
+
+            assert (extract_dir / "Game.iso").exists()
+            assert not (extract_dir / "readme.txt").exists()
+            assert not (extract_dir / "cover.jpg").exists()
+
+    def test_keeps_all_tracks_with_descriptor(self):
+        """Test that archives with a cue sheet keep every possible track."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_dir = Path(temp_dir)
+            archive = make_archive(
+                temp_dir / "Game.7z",
+                {
+                    "Game.cue": b'FILE "Game (Track 1).bin" BINARY\n',
+                    "Game (Track 1).bin": b"\0" * 2352,
+                    "Game (Track 2).wav": b"RIFF",
+                    "Game.nfo": b"release notes",
+                },
+            )
+
+            extractor = Extractor(temp_dir=temp_dir / "work", max_workers=1)
+            extract_dir = extractor.extract_archive(archive)
+
+            assert (extract_dir / "Game.cue").exists()
+            assert (extract_dir / "Game (Track 1).bin").exists()
+            assert (extract_dir / "Game (Track 2).wav").exists()
+            assert not (extract_dir / "Game.nfo").exists()
+
+            # The archive listing is reused instead of rescanning the directory
+            assert extract_dir in extractor.extracted_files
+            assert extractor.identify_disc_files(extract_dir) == [(extract_dir / "Game.cue", "cue")]
+            assert extract_dir not in extractor.extracted_files
+
+    def test_keeps_dat_track_referenced_by_descriptor(self):
+        """Test that a .dat track referenced by a cue sheet is extracted."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_dir = Path(temp_dir)
+            archive = make_archive(
+                temp_dir / "Game.7z",
+                {
+                    "Game.cue": b'FILE "Game.dat" BINARY\n  TRACK 01 MODE1/2352\n',
+                    "Game.dat": b"\0" * 2352,
+                    "readme.txt": b"hello",
+                },
+            )
+
+            extractor = Extractor(temp_dir=temp_dir / "work", max_workers=1)
+            extract_dir = extractor.extract_archive(archive)
+
+            assert (extract_dir / "Game.dat").exists()
+            assert not (extract_dir / "readme.txt").exists()
+
+    def test_cleanup_forgets_extracted_listing(self):
+        """Test that removing an extraction directory drops its recorded files."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_dir = Path(temp_dir)
+            archive = make_archive(temp_dir / "Game.7z", {"Game.iso": b"\0" * 2048})
+
+            extractor = Extractor(temp_dir=temp_dir / "work", max_workers=1)
+            extract_dir = extractor.extract_archive(archive)
+            assert extract_dir in extractor.extracted_files
+
+            extractor.cleanup_extracted_files(extract_dir)
+
+            assert not extract_dir.exists()
+            assert extract_dir not in extractor.extracted_files
+
+    def test_failed_extraction_leaves_no_listing(self):
+        """Test that a corrupt archive does not leave an entry behind."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_dir = Path(temp_dir)
+            archive = temp_dir / "Broken.7z"
+            archive.write_bytes(b"not an archive")
+
+            extractor = Extractor(temp_dir=temp_dir / "work", max_workers=1)
+            with pytest.raises(Exception):
+                extractor.extract_archive(archive)
+
+            assert extractor.extracted_files == {}
+
+
+class TestIdentifyDiscFiles:
+    """Test disc file identification."""
+
+    def test_descriptor_covers_tracks(self):
+        """Test that cue/gdi sheets are preferred over the tracks they reference."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_dir = Path(temp_dir)
+            for name in ["cue/Game.cue", "cue/Game (Track 1).bin", "cue/Game (Track 2).bin"]:
+                (temp_dir / name).parent.mkdir(parents=True, exist_ok=True)
+                (temp_dir / name).write_bytes(b"")
+            for name in ["gdi/Other.gdi", "gdi/track01.bin", "gdi/track02.raw"]:
+                (temp_dir / name).parent.mkdir(parents=True, exist_ok=True)
+                (temp_dir / name).write_bytes(b"")
+            (temp_dir / "Loose.bin").write_bytes(b"")
+
+            extractor = Extractor(temp_dir=temp_dir / "work", max_workers=1)
+            found = {
+                (path.name, file_type)
+                for path, file_type in extractor.identify_disc_files(temp_dir)
+            }
+
+            assert found == {("Game.cue", "cue"), ("Other.gdi", "gdi"), ("Loose.bin", "bin")}
+
+
+class TestAnalyzeArchive:
+    """Test archive analysis."""
+
+    def test_registers_existing_chds(self):
+        """Test that an archive whose discs are all converted registers their CHDs."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_dir = Path(temp_dir)
+            archive = make_archive(
+                temp_dir / "Game (Disc 1) [Rev 1].7z", {"Game (Disc 1).iso": b"\0" * 2048}
+            )
+            output_dir = temp_dir / "out"
+            output_dir.mkdir()
+            (output_dir / "Game (Disc 1).chd").write_bytes(b"chd")
+
+            playlist_manager = PlaylistManager(output_dir=output_dir)
+            extractor = Extractor(temp_dir=temp_dir / "work", max_workers=1, output_dir=output_dir)
+            extractor.set_playlist_manager(playlist_manager)
+
+            assert extractor.analyze_archive(archive)["can_skip"] is True
+            assert [d for _, d in playlist_manager.game_series["Game"]] == [1]
+
+
+class TestCheckSystemResources:
+    """Test system resource sampling."""
+
+    def test_sample_reused_within_ttl(self, monkeypatch):
+        """Test that back-to-back checks share one sample and never block on the CPU reading."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            extractor = Extractor(temp_dir=Path(temp_dir) / "work", max_workers=1)
+            samples = []
+            virtual_memory = psutil.virtual_memory
+            monkeypatch.setattr(
+                psutil, "virtual_memory", lambda: samples.append(1) or virtual_memory()
+            )
+            cpu_intervals = []
+            monkeypatch.setattr(
+                psutil, "cpu_percent", lambda interval: cpu_intervals.append(interval) or 0.0
+            )
+
+            first = extractor.check_system_resources()
+            second = extractor.check_system_resources()
+
+            assert second is first
+            assert len(samples) == 1
+            assert cpu_intervals == [None]
+
+
+class TestCleanup:
+    """Test temporary directory cleanup."""
+
+    def test_removes_leftover_extractions(self):
+        """Test that every leftover extraction directory and the temp directory are removed."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            work_dir = Path(temp_dir) / "work"
+            extractor = Extractor(temp_dir=work_dir, max_workers=1)
+            for name in ("A", "B", "C"):
+                (work_dir / name).mkdir()
+                (work_dir / name / "Game.bin").write_bytes(b"\0" * 2352)
+
+            extractor.cleanup()
+
+            assert not work_dir.exists()
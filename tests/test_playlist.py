@@ -0,0 +1,146 @@
+"""Test playlist manager functionality."""
+
+import pytest
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import lib.playlist as playlist_module
+from lib.playlist import PlaylistManager
+
+
+class TestExtractBaseNameAndDisc:
+    """Test disc number parsing."""
+
+    @pytest.mark.parametrize(
+        "filename, expected",
+        [
+            ("Final Fantasy VII (USA) (Disc 1)", ("Final Fantasy VII (USA)", 1)),
+            ("Metal Gear Solid [CD 2]", ("Metal Gear Solid", 2)),
+            ("Riven (Disk 5).chd", ("Riven", 5)),
+            ("Game - D3", ("Game", 3)),
+            ("Game_2", ("Game", 2)),
+            ("Crash Bandicoot (USA)", ("Crash Bandicoot (USA)", None)),
+        ],
+    )
+    def test_patterns(self, filename, expected):
+        """Test that common disc identifiers are recognised and stripped."""
+        manager = PlaylistManager()
+        assert manager._extract_base_name_and_disc(filename) == expected
+
+
+class TestAddToGameSeries:
+    """Test game series tracking."""
+
+    def test_discs_kept_in_order(self):
+        """Test that discs registered out of order are stored by disc number."""
+        manager = PlaylistManager()
+        for disc in (3, 1, 4, 2, 1):
+            manager._add_to_game_series("Riven", Path(f"Riven (Disc {disc}).chd"), disc)
+
+        assert [disc for _, disc in manager.game_series["Riven"]] == [1, 2, 3, 4]
+
+
+class TestFindRelatedDiscs:
+    """Test discovery of sibling discs in the output directory."""
+
+    def test_matches_base_name_literally(self):
+        """Test that siblings are found and regex characters in names are not wildcards."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_dir = Path(temp_dir)
+            for name in ["Dr. Mario (Disc 2).chd", "DrX Mario (Disc 3).chd", "Other (Disc 1).chd"]:
+                (temp_dir / name).write_bytes(b"chd")
+            manager = PlaylistManager(output_dir=temp_dir)
+            manager._add_to_game_series("Dr. Mario", temp_dir / "Dr. Mario (Disc 1).chd", 1)
+
+            manager._find_related_discs("Dr. Mario")
+
+            assert [disc for _, disc in manager.game_series["Dr. Mario"]] == [1, 2]
+
+    def test_output_dir_listed_once(self, monkeypatch):
+        """Test that registering many discs reuses one listing of the output directory."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_dir = Path(temp_dir)
+            for disc in (1, 2, 3):
+                (temp_dir / f"Riven (Disc {disc}).chd").write_bytes(b"chd")
+            listings = []
+            scan = playlist_module._scan_chd_files
+            monkeypatch.setattr(
+                playlist_module, "_scan_chd_files", lambda d: listings.append(d) or scan(d)
+            )
+            manager = PlaylistManager(output_dir=temp_dir)
+
+            for disc in (1, 2, 3):
+                manager.register_disc(temp_dir / f"Riven (Disc {disc}).chd", update_playlists=False)
+
+            assert listings == [temp_dir]
+            assert [disc for _, disc in manager.game_series["Riven"]] == [1, 2, 3]
+
+
+class TestCreatePlaylist:
+    """Test M3U generation."""
+
+    def test_entries_are_readable_paths(self):
+        """Test that generated entries are bare CHD names that read back intact."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_dir = Path(temp_dir)
+            manager = PlaylistManager(output_dir=temp_dir)
+            for disc in (2, 1):
+                chd_path = temp_dir / f"Riven (Disc {disc}).chd"
+                chd_path.write_bytes(b"chd")
+                manager.register_disc(chd_path, update_playlists=False)
+
+            m3u_path = manager._create_standard_playlist("Riven", temp_dir / "Riven.m3u")
+
+            assert manager._read_m3u_file(m3u_path) == ["Riven (Disc 1).chd", "Riven (Disc 2).chd"]
+
+
+class TestUpdatePlaylist:
+    """Test incremental playlist updates."""
+
+    def test_rewrites_only_changed_series(self):
+        """Test that unchanged series are skipped and new discs trigger a rewrite."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_dir = Path(temp_dir)
+            manager = PlaylistManager(output_dir=temp_dir)
+            for disc in (1, 2):
+                manager._add_to_game_series("Riven", temp_dir / f"Riven (Disc {disc}).chd", disc)
+
+            m3u_path = manager.update_playlist("Riven")
+            m3u_path.write_text("sentinel\n")
+            manager.scan_directory(update_all=True)
+            assert m3u_path.read_text() == "sentinel\n"
+
+            manager._add_to_game_series("Riven", temp_dir / "Riven (Disc 3).chd", 3)
+            manager.update_playlist("Riven")
+            assert "Riven (Disc 3).chd" in manager._read_m3u_file(m3u_path)
+
+    def test_repairs_legacy_playlist_with_saved_state(self):
+        """Test that playlists with old "# Disc N" entries are rewritten despite a saved state."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_dir = Path(temp_dir)
+            manager = PlaylistManager(output_dir=temp_dir)
+            for disc in (1, 2):
+                chd_path = temp_dir / f"Riven (Disc {disc}).chd"
+                chd_path.write_bytes(b"chd")
+                manager.register_disc(chd_path, update_playlists=False)
+            m3u_path = manager.update_playlist("Riven")
+            manager._save_state()
+
+            # A playlist as written before entries became bare paths
+            m3u_path.write_text(
+                "# Riven - Multi-disc game playlist\n"
+                "# Created by 7z-to-CHD Converter\n"
+                "#\n"
+                "Riven (Disc 1).chd # Disc 1\n"
+                "Riven (Disc 2).chd # Disc 2\n"
+            )
+
+            manager = PlaylistManager(output_dir=temp_dir)
+            manager.scan_directory(update_all=True)
+            manager.check_for_incomplete_series()
+
+            assert manager._read_m3u_file(m3u_path) == ["Riven (Disc 1).chd", "Riven (Disc 2).chd"]
@@ -4,12 +4,14 @@ import pytest
 import sys
 import tempfile
 import shutil
+import logging
 from pathlib import Path
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from lib.utils import Timer, confirm_path
+from lib import utils
+from lib.utils import Timer, confirm_path, is_nonempty_file, setup_logging
 
 
 class TestTimer:
@@ -75,3 +77,49 @@ class TestConfirmPath:
         with tempfile.NamedTemporaryFile() as temp_file:
             with pytest.raises(NotADirectoryError):
                 confirm_path(temp_file.name)
+
+
+class TestIsNonemptyFile:
+    """Test output file reuse checks."""
+
+    def test_file_with_content(self):
+        """Test that a file with content is reported."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "game.chd"
+            path.write_bytes(b"MComprHD")
+            assert is_nonempty_file(path) is True
+
+    def test_empty_file(self):
+        """Test that a zero-byte leftover is not reported."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "game.chd"
+            path.write_bytes(b"")
+            assert is_nonempty_file(path) is False
+
+    def test_missing_file_and_directory(self):
+        """Test that missing paths and directories are not reported."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            assert is_nonempty_file(Path(temp_dir) / "missing.chd") is False
+            assert is_nonempty_file(temp_dir) is False
+
+
+class TestSetupLogging:
+    """Test logging configuration."""
+
+    def test_records_reach_log_file(self):
+        """Test that records logged from any thread are written by the listener."""
+        root_logger = logging.getLogger()
+        saved_handlers, saved_level = root_logger.handlers[:], root_logger.level
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            try:
+                setup_logging(log_dir=temp_dir, console=False)
+                logging.getLogger("test").info("hello from the queue")
+            finally:
+                utils._stop_log_listener()
+                root_logger.handlers[:] = saved_handlers
+                root_logger.setLevel(saved_level)
+
+            log_files = list(Path(temp_dir).glob("7z-to-chd_*.log"))
+            assert len(log_files) == 1
+            assert "hello from the queue" in log_files[0].read_text(encoding="utf-8")